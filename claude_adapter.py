@@ -6,14 +6,50 @@ This adapter provides the stdio interface that Claude Desktop expects,
 while communicating with a Rhino socket server.
 """
 import sys
-import json
 import traceback
 import asyncio
+import orjson
 from rhino_mcp.rhino_client import RhinoClient
+from rhino_mcp.event_loop import run_event_loop, is_pollable
 
 # MCP protocol version
 PROTOCOL_VERSION = "2024-11-05"
 
+# Largest stdin line accepted by the stream reader (tool calls can carry
+# long point lists, well beyond asyncio's 64 KiB default)
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+# Result of tools/list; static, so it is built once at import time
+_TOOLS_LIST_RESULT = {
+    "tools": [{
+        "name": "rhino_create_curve",
+        "description": "Create a NURBS curve in Rhino",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "description": "Array of 3D points for the curve",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "x": {"type": "number"},
+                            "y": {"type": "number"},
+                            "z": {"type": "number"}
+                        },
+                        "required": ["x", "y", "z"]
+                    },
+                    "minItems": 2
+                }
+            },
+            "required": ["points"]
+        }
+    }]
+}
+
+# Binary stdout; messages are buffered and flushed once per batch
+_STDOUT = sys.stdout.buffer
+
 # Global state
 rhino_client = None
 
@@ -26,6 +62,7 @@ async def main():
             "tools": {}
         }
     })
+    flush_output()
 
     # Connect to Rhino
     global rhino_client
@@ -35,41 +72,100 @@ async def main():
         # Try to connect to Rhino
         if not rhino_client.connect():
             await send_log("error", "Failed to connect to Rhino server. Is it running?")
+            flush_output()
             return
         
         # Successfully connected
         await send_log("info", f"Connected to Rhino server at {rhino_client.host}:{rhino_client.port}")
+        flush_output()
+        
+        # Attach stdin to the event loop
+        reader = await open_stdin_reader()
         
         # Process incoming messages
         while True:
             # Read a line from stdin
-            line = await read_line()
+            try:
+                line = await read_line(reader)
+            except ValueError as e:
+                # Over-long line; read_line has already skipped the rest of it
+                await send_error(None, -32700, f"Parse error: {str(e)}")
+                flush_output()
+                continue
             if not line:
                 break
                 
             # Parse the message
             try:
-                message = json.loads(line)
+                message = orjson.loads(line)
                 
                 # Handle the message
                 await handle_message(message)
-            except json.JSONDecodeError:
-                await send_log("error", f"Invalid JSON: {line}")
+            except orjson.JSONDecodeError:
+                await send_log("error", f"Invalid JSON: {line.decode('utf-8', 'replace')}")
             except Exception as e:
                 await send_log("error", f"Error handling message: {str(e)}")
                 traceback.print_exc(file=sys.stderr)
+            finally:
+                # One flush per request, covering any log + response pair
+                flush_output()
     finally:
         # Disconnect from Rhino
         if rhino_client and rhino_client.connected:
             rhino_client.disconnect()
 
-async def read_line():
-    """Read a line from stdin asynchronously"""
-    return await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+async def open_stdin_reader():
+    """Wrap stdin in an asyncio StreamReader, or return None if stdin can't be a pipe transport"""
+    if sys.platform == "win32":
+        # The proactor loop cannot attach to a console or anonymous pipe stdin
+        return None
+    if not is_pollable(sys.stdin):
+        # A regular file or /dev/null; uvloop would abort instead of raising
+        return None
+    
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+    protocol = asyncio.StreamReaderProtocol(reader)
+    try:
+        await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+    except (ValueError, OSError):
+        # stdin is a regular file or otherwise not pollable
+        return None
+    return reader
+
+async def read_line(reader=None):
+    """Read a line from stdin asynchronously, as bytes; raises ValueError if it exceeds STDIN_LINE_LIMIT"""
+    if reader is not None:
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # Last line, without a trailing newline
+            return e.partial
+        except asyncio.LimitOverrunError:
+            await skip_line(reader)
+            raise ValueError(f"message exceeds {STDIN_LINE_LIMIT} bytes")
+    return await asyncio.get_event_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+async def skip_line(reader):
+    """Discard stdin up to and including the next newline"""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            # e.consumed bytes can be dropped without passing a newline
+            await reader.readexactly(e.consumed)
 
 async def send_message(message):
-    """Send a message to stdout"""
-    print(json.dumps(message), flush=True)
+    """Queue a message on stdout; it is written out by the next flush_output()"""
+    _STDOUT.write(orjson.dumps(message))
+    _STDOUT.write(b"\n")
+
+def flush_output():
+    """Flush queued stdout messages, once per handled request"""
+    _STDOUT.flush()
 
 async def send_response(id, result):
     """Send a JSON-RPC response"""
@@ -123,32 +219,7 @@ async def handle_message(message):
         await send_log("info", "Client initialized")
     elif method == "tools/list":
         # Return list of available tools
-        await send_response(msg_id, {
-            "tools": [{
-                "name": "rhino_create_curve",
-                "description": "Create a NURBS curve in Rhino",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "points": {
-                            "type": "array",
-                            "description": "Array of 3D points for the curve",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "x": {"type": "number"},
-                                    "y": {"type": "number"},
-                                    "z": {"type": "number"}
-                                },
-                                "required": ["x", "y", "z"]
-                            },
-                            "minItems": 2
-                        }
-                    },
-                    "required": ["points"]
-                }
-            }]
-        })
+        await send_response(msg_id, _TOOLS_LIST_RESULT)
     elif method == "tools/call":
         tool_name = params.get("name")
         tool_args = params.get("arguments", {})
@@ -192,7 +263,7 @@ async def handle_message(message):
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         sys.exit(0)
     except Exception as e:
@@ -13,6 +13,8 @@ setup(
     python_requires=">=3.10",
     install_requires=[
         "websockets>=11.0.0",
+        "orjson>=3.8.0",
+        "uvloop>=0.18.0; platform_system != 'Windows'",
         "typing-extensions>=4.0.0",
     ],
     extras_require={
@@ -22,7 +24,10 @@ setup(
             "pytest-asyncio>=0.21.0",
             "ruff>=0.0.270",
             "mypy>=1.0.0",
-        ]
+        ],
+        "msgpack": [
+            "msgpack>=1.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
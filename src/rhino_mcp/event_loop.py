@@ -0,0 +1,51 @@
+"""
+Event loop helpers shared by the MCP server and the stdio adapters.
+
+The server and both adapters run on uvloop when it is installed; these
+helpers keep that choice, and its caveats, in one place.
+"""
+from typing import Any, Coroutine, IO, TypeVar
+import os
+import stat
+import asyncio
+
+T = TypeVar('T')
+
+
+def run_event_loop(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on a new event loop.
+    
+    Uses uvloop when it is installed (it is not available on Windows) and
+    the standard asyncio loop otherwise.
+    
+    Args:
+        main: The coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+def is_pollable(stream: IO[Any]) -> bool:
+    """Check whether a stream can be watched by the event loop.
+    
+    Only pipes, sockets and terminals qualify. Check this before calling
+    connect_read_pipe: uvloop aborts the process, rather than raising, when
+    asked to watch a regular file or a device such as /dev/null.
+    
+    Args:
+        stream: The stream to check, e.g. sys.stdin
+    
+    Returns:
+        True if the stream is a pipe, socket or terminal
+    """
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stream.isatty()
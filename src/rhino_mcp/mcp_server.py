@@ -6,31 +6,83 @@ Claude AI to the Rhino client, enabling AI-assisted 3D modeling.
 
 Version: 1.0 (2025-03-13)
 """
-from typing import Dict, Any, Optional, List, Union, Callable, TypedDict
+from typing import (
+    Dict, Any, Optional, List, Tuple, Union, Callable, Awaitable, TypedDict, TYPE_CHECKING
+)
 import os
 import sys
-import json
 import logging
-import argparse
 from dataclasses import dataclass, field
 import traceback
+import socket
+import signal
 import asyncio
-import websockets
-from websockets.server import WebSocketServerProtocol
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 
-from rhino_mcp.rhino_client import RhinoClient, Point3d
+from rhino_mcp.rhino_client import RhinoClient, pack_points
+from rhino_mcp.event_loop import run_event_loop
+
+# websockets is imported when the server starts, keeping it (and argparse)
+# off the command-line startup path
+if TYPE_CHECKING:
+    from websockets.server import WebSocketServerProtocol
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger("rhino_mcp")
 
+# Reconnection policy for the Rhino Bridge connection
+RHINO_CONNECT_ATTEMPTS = 3
+RHINO_CONNECT_BACKOFF = 0.1  # seconds, doubled after each failed attempt
+
+# Worker threads for blocking Rhino client calls
+RHINO_MAX_WORKERS = 4
+
+# Listening socket tuning
+LISTEN_BACKLOG = 128
+SOCKET_BUFFER_SIZE = 1 << 20  # bytes, for SO_SNDBUF/SO_RCVBUF
+
+# A WebSocket message of the form ["BATCH", request, ...] carries several
+# independent messages (sent by ws_adapter.py's batching mode); each one is
+# answered as if it had arrived on its own
+BATCH_ENVELOPE = "BATCH"
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string using orjson.
+    
+    orjson returns bytes; decoding keeps responses on WebSocket text frames,
+    which is what JSON-RPC clients expect.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        The JSON-encoded string
+    """
+    return orjson.dumps(obj).decode('utf-8')
+
+
+def _jsonrpc_error(req_id: Union[str, int, None], code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response.
+    
+    Args:
+        req_id: The id of the request being answered
+        code: The JSON-RPC error code
+        message: The error message
+        
+    Returns:
+        The JSON-RPC error response
+    """
+    return {
+        'jsonrpc': '2.0',
+        'id': req_id,
+        'error': {
+            'code': code,
+            'message': message
+        }
+    }
+
 
 class MCPRequestSchema(TypedDict):
     """Type definition for MCP request schema."""
@@ -54,6 +106,16 @@ class MCPErrorSchema(TypedDict):
     error: Dict[str, Any]
 
 
+# Coroutine function that reports partial results of a tool invocation
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Coroutine function that handles a tool invocation
+ToolHandler = Callable[[Dict[str, Any], Optional[ProgressCallback]], Awaitable[Dict[str, Any]]]
+
+# Coroutine function that sends a JSON-RPC notification to the client
+NotifyCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
 @dataclass
 class MCPTool:
     """Class representing an MCP tool.
@@ -62,12 +124,12 @@ class MCPTool:
         name: The name of the tool
         description: The description of the tool
         parameters: The parameters schema of the tool
-        handler: The function to handle tool invocation
+        handler: The coroutine function to handle tool invocation
     """
     name: str
     description: str
     parameters: Dict[str, Any]
-    handler: Callable[[Dict[str, Any]], Dict[str, Any]]
+    handler: ToolHandler
 
 
 class RhinoMCPServer:
@@ -81,6 +143,7 @@ class RhinoMCPServer:
         port: The port to bind the server to
         rhino_client: The Rhino client to use for communication with Rhino
         tools: The list of available MCP tools
+        _tool_handlers: Mapping of tool name to handler, used for dispatch
     """
     
     def __init__(
@@ -88,7 +151,8 @@ class RhinoMCPServer:
         host: str = '127.0.0.1', 
         port: int = 5000,
         rhino_host: str = '127.0.0.1',
-        rhino_port: int = 8888
+        rhino_port: int = 8888,
+        reuse_port: bool = False
     ):
         """Initialize the MCP server.
         
@@ -97,14 +161,37 @@ class RhinoMCPServer:
             port: The port to bind the server to
             rhino_host: The hostname of the Rhino Bridge server
             rhino_port: The port of the Rhino Bridge server
+            reuse_port: Set SO_REUSEPORT on the listening socket (where
+                supported) so a replacement server can bind the port while
+                the old one drains
         """
         self.host = host
         self.port = port
+        self.reuse_port = reuse_port
         self.rhino_client = RhinoClient(rhino_host, rhino_port)
         self.tools: List[MCPTool] = []
+        self._tool_handlers: Dict[str, ToolHandler] = {}
+        # Serializes connection attempts; made on first use, since an asyncio
+        # lock belongs to the event loop it is first used on
+        self._rhino_lock: Optional[asyncio.Lock] = None
+        self._rhino_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Dedicated pool so blocking Rhino calls never tie up the loop's
+        # default executor; RhinoClient itself serializes socket access
+        self._executor = ThreadPoolExecutor(
+            max_workers=RHINO_MAX_WORKERS,
+            thread_name_prefix='rhino'
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Discovery caches, built on first use and reset when a tool is added
+        self._tools_schema: Optional[List[Dict[str, Any]]] = None
+        self._discover_result: Optional[Dict[str, Any]] = None
+        self._discover_result_json: Optional[str] = None
         
         # Register built-in tools
         self._register_tools()
+        self._warm_up()
         
     def _register_tools(self) -> None:
         """Register built-in MCP tools.
@@ -116,7 +203,7 @@ class RhinoMCPServer:
             None
         """
         # Create NURBS curve tool
-        self.tools.append(MCPTool(
+        self._add_tool(MCPTool(
             name="rhino_create_curve",
             description="Create a NURBS curve in Rhino",
             parameters={
@@ -143,7 +230,7 @@ class RhinoMCPServer:
         ))
         
         # Tool for pinging Rhino
-        self.tools.append(MCPTool(
+        self._add_tool(MCPTool(
             name="rhino_ping",
             description="Ping Rhino to check if it's connected and get information",
             parameters={
@@ -154,7 +241,7 @@ class RhinoMCPServer:
         ))
         
         # Tool for running Python script in Rhino
-        self.tools.append(MCPTool(
+        self._add_tool(MCPTool(
             name="rhino_run_script",
             description="Run a Python script in Rhino's Python context",
             parameters={
@@ -163,6 +250,10 @@ class RhinoMCPServer:
                     "script": {
                         "type": "string",
                         "description": "Python script to run in Rhino"
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Stream printed output as rhino_run_script/partial notifications"
                     }
                 },
                 "required": ["script"]
@@ -170,11 +261,98 @@ class RhinoMCPServer:
             handler=self._handle_run_script
         ))
     
-    def _handle_create_curve(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _warm_up(self) -> None:
+        """Do one-time encoder work at startup instead of on the first request.
+        
+        Exercises orjson's encoder and decoder and pre-encodes the
+        rpc.discover result, which is the first thing a client asks for.
+        
+        Returns:
+            None
+        """
+        orjson.loads(orjson.dumps({'a': 1, 'b': 'c', 'd': [1, 2, 3]}))
+        self._discover_response_json(0)
+    
+    def _add_tool(self, tool: MCPTool) -> None:
+        """Add a tool to the registry and the dispatch index.
+        
+        Args:
+            tool: The tool to register
+            
+        Returns:
+            None
+        """
+        self.tools.append(tool)
+        self._tool_handlers[tool.name] = tool.handler
+        self._tools_schema = None
+        self._discover_result = None
+        self._discover_result_json = None
+    
+    async def _ensure_connected(self) -> None:
+        """Connect the Rhino client if it is not connected.
+        
+        The connection attempt runs in an executor so a slow or unreachable
+        Rhino Bridge does not block the event loop. Failed attempts are
+        retried with exponential backoff.
+        
+        Returns:
+            None
+            
+        Raises:
+            ConnectionError: If all connection attempts fail
+        """
+        async with self._get_rhino_lock():
+            if self.rhino_client.connected:
+                return
+            
+            delay = RHINO_CONNECT_BACKOFF
+            for attempt in range(RHINO_CONNECT_ATTEMPTS):
+                try:
+                    await self._call_rhino(self.rhino_client.connect)
+                    return
+                except ConnectionError:
+                    if attempt == RHINO_CONNECT_ATTEMPTS - 1:
+                        raise
+                    logger.warning(f"Rhino connection failed, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    delay *= 2
+    
+    def _get_rhino_lock(self) -> asyncio.Lock:
+        """Get the connection lock for the running event loop.
+        
+        A new lock is made when the server is used from a different loop
+        than before (e.g. start() after calls made under asyncio.run).
+        
+        Returns:
+            The lock serializing connection attempts
+        """
+        loop = asyncio.get_running_loop()
+        if self._rhino_lock is None or self._rhino_lock_loop is not loop:
+            self._rhino_lock = asyncio.Lock()
+            self._rhino_lock_loop = loop
+        return self._rhino_lock
+    
+    async def _call_rhino(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking Rhino client call without blocking the event loop.
+        
+        Args:
+            func: The Rhino client method to call
+            *args: Positional arguments for the call
+            
+        Returns:
+            The return value of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def _handle_create_curve(
+        self, params: Dict[str, Any], progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """Handle create_curve tool invocation.
         
         Args:
             params: The parameters for the tool invocation
+            progress: Callback for partial results (unused)
             
         Returns:
             The tool invocation result
@@ -188,21 +366,14 @@ class RhinoMCPServer:
         if not points_data or len(points_data) < 2:
             raise ValueError("At least 2 points are required to create a curve")
         
-        # Format points for Rhino client
-        points: List[Point3d] = []
-        for pt in points_data:
-            points.append({
-                'x': float(pt.get('x', 0.0)),
-                'y': float(pt.get('y', 0.0)),
-                'z': float(pt.get('z', 0.0))
-            })
+        # Pack points into a flat float64 array (x, y, z per point)
+        coords = pack_points(points_data)
         
         # Ensure Rhino client is connected
-        if not self.rhino_client.connected:
-            self.rhino_client.connect()
+        await self._ensure_connected()
         
         # Create the curve
-        result = self.rhino_client.create_curve(points)
+        result = await self._call_rhino(self.rhino_client.create_curve_binary, coords)
         
         # Format response
         if result.get('status') == 'success':
@@ -218,21 +389,23 @@ class RhinoMCPServer:
                 'error': result.get('traceback', '')
             }
     
-    def _handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_ping(
+        self, params: Dict[str, Any], progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """Handle ping tool invocation.
         
         Args:
             params: The parameters for the tool invocation
+            progress: Callback for partial results (unused)
             
         Returns:
             The tool invocation result
         """
         # Ensure Rhino client is connected
-        if not self.rhino_client.connected:
-            self.rhino_client.connect()
+        await self._ensure_connected()
         
         # Ping Rhino
-        result = self.rhino_client.ping()
+        result = await self._call_rhino(self.rhino_client.ping)
         
         # Format response
         if result.get('status') == 'success':
@@ -248,11 +421,17 @@ class RhinoMCPServer:
                 'error': result.get('traceback', '')
             }
     
-    def _handle_run_script(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_run_script(
+        self, params: Dict[str, Any], progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """Handle run_script tool invocation.
         
+        With 'stream' set and a progress callback available, the script's
+        printed output is reported through the callback as it is produced.
+        
         Args:
             params: The parameters for the tool invocation
+            progress: Callback for partial results
             
         Returns:
             The tool invocation result
@@ -267,11 +446,14 @@ class RhinoMCPServer:
             raise ValueError("Script cannot be empty")
         
         # Ensure Rhino client is connected
-        if not self.rhino_client.connected:
-            self.rhino_client.connect()
+        await self._ensure_connected()
         
-        # Run the script
-        result = self.rhino_client.run_script(script)
+        # Run the script, asking for the traceback of a failure since it is
+        # passed back to the caller as the error
+        if progress is not None and params.get('stream'):
+            result = await self._run_script_streaming(script, progress)
+        else:
+            result = await self._call_rhino(self.rhino_client.run_script, script, True)
         
         # Format response
         if result.get('status') == 'success':
@@ -287,33 +469,108 @@ class RhinoMCPServer:
                 'error': result.get('traceback', '')
             }
     
+    async def _run_script_streaming(
+        self, script: str, progress: ProgressCallback
+    ) -> Dict[str, Any]:
+        """Run a script in Rhino and report its output chunks as they arrive.
+        
+        The blocking client call runs in the executor; chunks are handed to
+        the event loop through a queue and passed to the progress callback.
+        
+        Args:
+            script: The Python script to run
+            progress: Callback for partial results
+            
+        Returns:
+            The final response from the Rhino Bridge
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        
+        def forward(chunk: str) -> None:
+            loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        
+        def run() -> Dict[str, Any]:
+            try:
+                return self.rhino_client.run_script_stream(script, forward, verbose=True)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+        
+        future = loop.run_in_executor(self._executor, run)
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            await progress({'chunk': chunk})
+        return await future
+    
     def get_tools_schema(self) -> List[Dict[str, Any]]:
         """Get the schema for all registered tools.
         
+        The schema is built once and cached until another tool is registered;
+        callers must treat the returned list as read-only.
+        
         Returns:
             List of tool schemas in MCP format
         """
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.parameters
+        if self._tools_schema is None:
+            self._tools_schema = [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.parameters
+                }
+                for tool in self.tools
+            ]
+        return self._tools_schema
+    
+    def _get_discover_result(self) -> Dict[str, Any]:
+        """Get the cached result of an rpc.discover request.
+        
+        Returns:
+            MCP server information and tool schemas
+        """
+        if self._discover_result is None:
+            self._discover_result = {
+                'name': 'rhino_mcp',
+                'version': '1.0.0',
+                'functions': self.get_tools_schema()
             }
-            for tool in self.tools
-        ]
+        return self._discover_result
     
-    async def handle_jsonrpc(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _discover_response_json(self, req_id: Any) -> str:
+        """Get the encoded rpc.discover response for a request id.
+        
+        Only the id differs between responses, so the encoded result is
+        cached and spliced into the response envelope.
+        
+        Args:
+            req_id: The id of the request being answered
+            
+        Returns:
+            The JSON-encoded rpc.discover response
+        """
+        if self._discover_result_json is None:
+            self._discover_result_json = _dumps(self._get_discover_result())
+        return f'{{"jsonrpc":"2.0","id":{_dumps(req_id)},"result":{self._discover_result_json}}}'
+    
+    async def handle_jsonrpc(
+        self, request: Dict[str, Any], notify: Optional[NotifyCallback] = None
+    ) -> Dict[str, Any]:
         """Handle a JSON-RPC request.
         
+        If notify is given, partial results of the tool call are sent through
+        it as '<method>/partial' notifications carrying the request id.
+        
         Args:
             request: The JSON-RPC request
+            notify: Callback for sending notifications to the client
             
         Returns:
             The JSON-RPC response
         """
-        # Extract request data
-        method = request.get('method', '')
-        params = request.get('params', {})
+        # Extract request data; params is only looked up for tool calls
+        method = request.get('method')
         req_id = request.get('id', 0)
         
         # Handle different methods
@@ -322,49 +579,78 @@ class RhinoMCPServer:
             return {
                 'jsonrpc': '2.0',
                 'id': req_id,
-                'result': {
-                    'name': 'rhino_mcp',
-                    'version': '1.0.0',
-                    'functions': self.get_tools_schema()
-                }
+                'result': self._get_discover_result()
             }
-        elif method.startswith('rhino_'):
-            # Handle tool invocation
-            for tool in self.tools:
-                if tool.name == method:
-                    try:
-                        result = tool.handler(params)
-                        return {
-                            'jsonrpc': '2.0',
-                            'id': req_id,
-                            'result': result
-                        }
-                    except Exception as e:
-                        logger.error(f"Tool error: {str(e)}")
-                        traceback.print_exc()
-                        return {
-                            'jsonrpc': '2.0',
-                            'id': req_id,
-                            'error': {
-                                'code': -32000,
-                                'message': str(e),
-                                'data': {
-                                    'traceback': traceback.format_exc()
-                                }
-                            }
-                        }
+        
+        if not isinstance(method, str):
+            return _jsonrpc_error(req_id, -32600, 'Invalid Request: method must be a string')
+        
+        # Handle tool invocation
+        handler = self._tool_handlers.get(method)
+        if handler is not None:
+            params = request.get('params')
+            if params is None:
+                params = {}
+            elif not isinstance(params, dict):
+                return _jsonrpc_error(req_id, -32602, 'Invalid params: params must be an object')
+            
+            progress: Optional[ProgressCallback] = None
+            if notify is not None:
+                partial_method = f'{method}/partial'
+                
+                async def report(data: Dict[str, Any]) -> None:
+                    await notify(partial_method, {'id': req_id, **data})
+                progress = report
+            
+            try:
+                result = await handler(params, progress)
+                return {
+                    'jsonrpc': '2.0',
+                    'id': req_id,
+                    'result': result
+                }
+            except Exception as e:
+                logger.error(f"Tool error: {str(e)}")
+                response = _jsonrpc_error(req_id, -32000, str(e))
+                # Formatting a traceback walks the whole stack; only pay for
+                # it when debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    tb = traceback.format_exc()
+                    logger.debug(tb)
+                    response['error']['data'] = {'traceback': tb}
+                return response
         
         # Method not found
-        return {
-            'jsonrpc': '2.0',
-            'id': req_id,
-            'error': {
-                'code': -32601,
-                'message': f'Method not found: {method}'
-            }
-        }
+        return _jsonrpc_error(req_id, -32601, f'Method not found: {method}')
     
-    async def handle_websocket(self, websocket: WebSocketServerProtocol) -> None:
+    async def handle_batch(
+        self, requests: List[Any]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Handle a JSON-RPC batch request.
+        
+        The calls are handled in order and answered together in a single
+        response array, so a client issuing many small calls pays for one
+        WebSocket frame each way instead of one per call.
+        
+        Args:
+            requests: The JSON-RPC requests in the batch
+            
+        Returns:
+            The list of JSON-RPC responses, or a single error response if
+            the batch is empty
+        """
+        if not requests:
+            return _jsonrpc_error(None, -32600, 'Invalid Request')
+        
+        responses: List[Dict[str, Any]] = []
+        for request in requests:
+            if isinstance(request, dict):
+                responses.append(await self.handle_jsonrpc(request))
+            else:
+                responses.append(_jsonrpc_error(None, -32600, 'Invalid Request'))
+        return responses
+    
+    async def handle_websocket(self, websocket: "WebSocketServerProtocol") -> None:
         """Handle a WebSocket connection.
         
         Args:
@@ -376,48 +662,54 @@ class RhinoMCPServer:
         logger.info(f"Client connected: {websocket.remote_address}")
         
         # Ensure Rhino client is connected
-        if not self.rhino_client.connected:
-            try:
-                self.rhino_client.connect()
-            except Exception as e:
-                logger.error(f"Failed to connect to Rhino: {str(e)}")
-                await websocket.close(1011, "Failed to connect to Rhino")
-                return
+        try:
+            await self._ensure_connected()
+        except Exception as e:
+            logger.error(f"Failed to connect to Rhino: {str(e)}")
+            await websocket.close(1011, "Failed to connect to Rhino")
+            return
+        
+        async def notify(method: str, params: Dict[str, Any]) -> None:
+            await websocket.send(_dumps({'jsonrpc': '2.0', 'method': method, 'params': params}))
         
         try:
             async for message in websocket:
                 # Parse the message
                 try:
-                    request = json.loads(message)
-                    logger.info(f"Received request: {request.get('method', 'unknown')}")
-                    
-                    # Handle the request
-                    response = await self.handle_jsonrpc(request)
-                    
-                    # Send the response
-                    await websocket.send(json.dumps(response))
-                    
-                except json.JSONDecodeError:
+                    request = orjson.loads(message)
+                except orjson.JSONDecodeError:
                     logger.error("Invalid JSON")
-                    await websocket.send(json.dumps({
-                        'jsonrpc': '2.0',
-                        'id': None,
-                        'error': {
-                            'code': -32700,
-                            'message': 'Parse error'
-                        }
-                    }))
-                except Exception as e:
-                    logger.error(f"Websocket error: {str(e)}")
-                    traceback.print_exc()
-                    await websocket.send(json.dumps({
-                        'jsonrpc': '2.0',
-                        'id': None,
-                        'error': {
-                            'code': -32603,
-                            'message': str(e)
-                        }
-                    }))
+                    await websocket.send(_dumps(_jsonrpc_error(None, -32700, 'Parse error')))
+                    continue
+                
+                # Unpack batching envelopes into their messages
+                if isinstance(request, list) and request and request[0] == BATCH_ENVELOPE:
+                    requests = request[1:]
+                else:
+                    requests = [request]
+                
+                for request in requests:
+                    try:
+                        # Handle the request
+                        if isinstance(request, list):
+                            logger.info(f"Received batch of {len(request)} requests")
+                            response = await self.handle_batch(request)
+                        elif isinstance(request, dict):
+                            logger.info(f"Received request: {request.get('method', 'unknown')}")
+                            if request.get('method') == 'rpc.discover':
+                                # Static response; skip building and encoding dicts
+                                await websocket.send(self._discover_response_json(request.get('id', 0)))
+                                continue
+                            response = await self.handle_jsonrpc(request, notify)
+                        else:
+                            response = _jsonrpc_error(None, -32600, 'Invalid Request')
+                        
+                        # Send the response
+                        await websocket.send(_dumps(response))
+                    except Exception as e:
+                        logger.error(f"Websocket error: {str(e)}")
+                        logger.debug("Websocket error details", exc_info=True)
+                        await websocket.send(_dumps(_jsonrpc_error(None, -32603, str(e))))
         except Exception as e:
             logger.error(f"Connection error: {str(e)}")
         finally:
@@ -429,10 +721,65 @@ class RhinoMCPServer:
         Returns:
             None
         """
-        # Start the WebSocket server
-        async with websockets.serve(self.handle_websocket, self.host, self.port):
-            logger.info(f"MCP server started at ws://{self.host}:{self.port}")
-            await asyncio.Future()  # Run forever
+        import websockets
+        # Resolve the lazily imported server API (and its permessage-deflate
+        # extension) before accepting connections
+        serve = websockets.serve
+        
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        
+        # Stop on SIGINT/SIGTERM; where signal handlers are unavailable
+        # (Windows, or a non-main thread) Ctrl+C still surfaces as
+        # KeyboardInterrupt in start_in_thread
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self._stop_event.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        
+        # Start the WebSocket server. It binds every address the host
+        # resolves to (e.g. both 127.0.0.1 and ::1 for localhost); on POSIX
+        # asyncio also sets SO_REUSEADDR (on Windows that would allow
+        # stealing a bound port, so it is left off there)
+        reuse_port = self.reuse_port and hasattr(socket, 'SO_REUSEPORT')
+        async with serve(
+            self.handle_websocket, self.host, self.port,
+            backlog=LISTEN_BACKLOG, reuse_port=reuse_port
+        ) as server:
+            for sock in server.sockets:
+                self._tune_listen_socket(sock)
+                host, port = sock.getsockname()[:2]
+                if ':' in host:
+                    host = f"[{host}]"
+                logger.info(f"MCP server started at ws://{host}:{port}")
+            await self._stop_event.wait()
+        logger.info("MCP server stopped")
+    
+    def _tune_listen_socket(self, sock: socket.socket) -> None:
+        """Set the options accepted connections inherit on a listening socket.
+        
+        Args:
+            sock: A listening socket of the WebSocket server
+            
+        Returns:
+            None
+        """
+        # Accepted sockets inherit these on most platforms
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    
+    def stop(self) -> None:
+        """Request the running server to shut down.
+        
+        Safe to call from any thread.
+        
+        Returns:
+            None
+        """
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
     
     def start_in_thread(self) -> None:
         """Start the MCP server in a separate thread.
@@ -441,7 +788,7 @@ class RhinoMCPServer:
             None
         """
         try:
-            asyncio.run(self.start())
+            run_event_loop(self.start())
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
         except Exception as e:
@@ -450,14 +797,45 @@ class RhinoMCPServer:
         finally:
             if self.rhino_client.connected:
                 self.rhino_client.disconnect()
+            self._executor.shutdown(wait=False)
 
 
-def main() -> None:
-    """Start the MCP server from the command line.
+# Command line options: flag -> (option name, value type)
+_CLI_OPTIONS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    '--host': ('host', str),
+    '--port': ('port', int),
+    '--rhino-host': ('rhino_host', str),
+    '--rhino-port': ('rhino_port', int),
+}
+# Boolean switches: flag -> option name
+_CLI_FLAGS: Dict[str, str] = {
+    '--debug': 'debug',
+    '--reuse-port': 'reuse_port',
+}
+_CLI_DEFAULTS: Dict[str, Any] = {
+    'host': '127.0.0.1',
+    'port': 5000,
+    'rhino_host': '127.0.0.1',
+    'rhino_port': 8888,
+    'debug': False,
+    'reuse_port': False,
+}
+
+
+def _parse_args_full(argv: List[str]) -> Dict[str, Any]:
+    """Parse command line arguments with argparse.
+    
+    Used for --help and for any command line the fast parser rejects, so
+    usage and error messages come from argparse.
     
+    Args:
+        argv: The command line arguments, without the program name
+        
     Returns:
-        None
+        Mapping of option name to value
     """
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Start the RhinoMCP server')
     parser.add_argument('--host', type=str, default='127.0.0.1',
                         help='Hostname to bind the MCP server to')
@@ -469,23 +847,78 @@ def main() -> None:
                         help='Port of the Rhino Bridge server')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug logging')
+    parser.add_argument('--reuse-port', action='store_true',
+                        help='Set SO_REUSEPORT on the listening socket')
+    
+    return vars(parser.parse_args(argv))
+
+
+def parse_args(argv: List[str]) -> Dict[str, Any]:
+    """Parse command line arguments.
+    
+    Handles the handful of supported options (both "--opt value" and
+    "--opt=value" forms, plus boolean switches) without importing argparse, falling back to
+    argparse for anything else.
+    
+    Args:
+        argv: The command line arguments, without the program name
+        
+    Returns:
+        Mapping of option name to value
+    """
+    options = dict(_CLI_DEFAULTS)
+    args = iter(argv)
+    try:
+        for arg in args:
+            if arg in _CLI_FLAGS:
+                options[_CLI_FLAGS[arg]] = True
+                continue
+            flag, sep, value = arg.partition('=')
+            name, convert = _CLI_OPTIONS[flag]
+            if not sep:
+                value = next(args)
+                if value.startswith('-'):
+                    # Most likely a missing value ("--host --debug"); leave
+                    # the error, or a negative number, to argparse
+                    return _parse_args_full(argv)
+            options[name] = convert(value)
+    except (KeyError, ValueError, StopIteration):
+        return _parse_args_full(argv)
+    return options
+
+
+def main() -> None:
+    """Start the MCP server from the command line.
+    
+    Returns:
+        None
+    """
+    args = parse_args(sys.argv[1:])
     
-    args = parser.parse_args()
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
     
     # Set log level
-    if args.debug:
+    if args['debug']:
         logger.setLevel(logging.DEBUG)
     
     # Start the server
     server = RhinoMCPServer(
-        host=args.host,
-        port=args.port,
-        rhino_host=args.rhino_host,
-        rhino_port=args.rhino_port
+        host=args['host'],
+        port=args['port'],
+        rhino_host=args['rhino_host'],
+        rhino_port=args['rhino_port'],
+        reuse_port=args['reuse_port']
     )
     
-    print(f"Starting RhinoMCP server at ws://{args.host}:{args.port}")
-    print(f"Connecting to Rhino at {args.rhino_host}:{args.rhino_port}")
+    print(f"Starting RhinoMCP server at ws://{args['host']}:{args['port']}")
+    print(f"Connecting to Rhino at {args['rhino_host']}:{args['rhino_port']}")
     print("Press Ctrl+C to stop")
     
     try:
@@ -6,13 +6,218 @@ and provides methods to send commands and receive responses.
 
 Version: 1.0 (2025-03-13)
 """
-from typing import Dict, Any, Optional, List, Tuple, Union, TypedDict
+from typing import Dict, Any, Optional, List, Tuple, Union, Sequence, Mapping, Callable, TypedDict
+import sys
 import socket
-import json
+import orjson
 import time
+import base64
+import struct
 import threading
+import math
+from array import array
+from itertools import chain
+from operator import itemgetter
 from dataclasses import dataclass
 
+# msgpack is optional; commands are sent as MessagePack when it is installed
+try:
+    import msgpack  # type: ignore[import]
+except ImportError:
+    msgpack = None
+
+
+# Wire framing: every message is a 4-byte big-endian payload length and a
+# 1-byte content type, followed by the payload
+FRAME_HEADER = struct.Struct('>IB')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Payload content types; the bridge replies in the content type of the command
+CONTENT_JSON = 0x01
+CONTENT_MSGPACK = 0x02
+
+# A length of CHUNKED_FRAME announces a message sent as a series of chunks,
+# each with a 4-byte big-endian length, ended by a zero-length chunk
+CHUNKED_FRAME = 0xFFFFFFFF
+CHUNK_HEADER = struct.Struct('>I')
+
+# Size of the per-connection receive buffer; frames that fit are parsed out
+# of it, so a header and its payload usually arrive in a single recv
+RECV_BUFFER_SIZE = 64 * 1024
+
+
+_POINT_COORDS = itemgetter('x', 'y', 'z')
+
+# Errors meaning the bridge dropped a kept-alive connection (e.g. it was
+# restarted); if sending a command fails with one, it is sent once more on
+# a fresh connection
+_RESET_ERRORS = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+# Flags for a non-blocking peek at a connection before sending on it
+_MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
+_PEEK_FLAGS = socket.MSG_PEEK | _MSG_DONTWAIT
+
+# Per-thread persistent clients handed out by get_default()
+_default_clients = threading.local()
+
+
+def pack_points(points: Sequence[Mapping[str, Any]]) -> array:
+    """Validate point objects and pack them into a flat float64 array.
+    
+    On the fast path every point carries all three numeric coordinates and
+    extraction and conversion run entirely in C (itemgetter, chain and the
+    array constructor). Otherwise missing coordinates default to 0.0 and
+    values are coerced with float().
+    
+    Args:
+        points: Sequence of points, each a dict with x, y, z keys
+        
+    Returns:
+        The packed coordinates (x0, y0, z0, x1, y1, z1, ...)
+        
+    Raises:
+        ValueError: If a coordinate is not a finite number
+    """
+    try:
+        coords = array('d', list(chain.from_iterable(map(_POINT_COORDS, points))))
+    except (KeyError, TypeError):
+        coords = array('d', [
+            float(c) for pt in points
+            for c in (pt.get('x', 0.0), pt.get('y', 0.0), pt.get('z', 0.0))
+        ])
+    
+    _check_finite(coords)
+    return coords
+
+
+def _check_points_finite(points: Sequence[Mapping[str, Any]]) -> None:
+    """Check that point objects only hold finite coordinates, without packing them.
+    
+    Coordinates are read as in pack_points. In the common case this is a
+    single sum over the coordinates, run in C; values are only checked one
+    by one when that sum is not finite or not computable.
+    
+    Args:
+        points: Sequence of points, each a dict with x, y, z keys
+        
+    Returns:
+        None
+        
+    Raises:
+        ValueError: If a coordinate is not a finite number
+    """
+    try:
+        if math.isfinite(sum(chain.from_iterable(map(_POINT_COORDS, points)))):
+            return
+    except (KeyError, TypeError):
+        pass
+    
+    coords = [
+        float(c) for pt in points
+        for c in (pt.get('x', 0.0), pt.get('y', 0.0), pt.get('z', 0.0))
+    ]
+    if not all(map(math.isfinite, coords)):
+        raise ValueError("Point coordinates must be finite numbers")
+
+
+def _check_finite(coords: array) -> None:
+    """Check that all packed coordinates are finite.
+    
+    Args:
+        coords: The packed coordinates
+        
+    Returns:
+        None
+        
+    Raises:
+        ValueError: If a coordinate is NaN or infinite
+    """
+    # A non-finite sum can also come from overflow, so confirm element-wise
+    if not math.isfinite(sum(coords)) and not all(map(math.isfinite, coords)):
+        raise ValueError("Point coordinates must be finite numbers")
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode binary values as base64 text for JSON commands.
+    
+    Args:
+        obj: The object orjson cannot serialize
+        
+    Returns:
+        The base64 text of a bytes-like object
+        
+    Raises:
+        TypeError: If the object is not bytes-like
+    """
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode('ascii')
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _encode_message(message: Dict[str, Any], content_type: int) -> bytes:
+    """Encode a message in the given content type.
+    
+    Args:
+        message: The message to encode
+        content_type: CONTENT_JSON or CONTENT_MSGPACK
+        
+    Returns:
+        The encoded message
+    """
+    if content_type == CONTENT_MSGPACK:
+        return msgpack.packb(message, use_bin_type=True)
+    return orjson.dumps(message, default=_json_default)
+
+
+def _decode_message(content_type: int, payload: Union[bytes, bytearray]) -> Dict[str, Any]:
+    """Decode a message of the given content type.
+    
+    Args:
+        content_type: CONTENT_JSON or CONTENT_MSGPACK
+        payload: The encoded message
+        
+    Returns:
+        The decoded message
+    """
+    if content_type == CONTENT_MSGPACK:
+        # Script results may be dicts with non-string keys, which JSON
+        # would have turned into strings
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return orjson.loads(payload)
+
+
+def _as_float64_le(coords: Any) -> array:
+    """Convert flat coordinates to a little-endian float64 array.
+    
+    Objects exposing a float64 buffer (array('d'), numpy arrays of any
+    shape, memoryviews) are copied in one block without iterating their
+    values and without needing numpy here; anything else must be a flat
+    sequence of numbers.
+    
+    Args:
+        coords: The coordinates to convert
+        
+    Returns:
+        The coordinates as an array('d') in little-endian byte order
+    """
+    try:
+        view = memoryview(coords)
+    except TypeError:
+        view = None
+    
+    if view is not None and view.format.lstrip('@=<>!') == 'd' and view.c_contiguous:
+        packed = array('d')
+        packed.frombytes(view.cast('B'))
+        order = view.format[0]
+        little = order == '<' or (order not in '>!' and sys.byteorder == 'little')
+    else:
+        packed = array('d', coords)
+        little = sys.byteorder == 'little'
+    
+    if not little:
+        packed.byteswap()
+    return packed
+
 
 class Point3d(TypedDict):
     """Type definition for a 3D point with x, y, z coordinates."""
@@ -32,19 +237,42 @@ class RhinoClient:
         port: The port number of the Rhino Bridge server
         socket: The socket connection to the Rhino Bridge server
         connected: Whether the client is currently connected to the server
+        content_type: The content type commands are sent in
     """
     
-    def __init__(self, host: str = '127.0.0.1', port: int = 8888):
+    def __init__(
+        self, host: str = '127.0.0.1', port: int = 8888, use_msgpack: Optional[bool] = None
+    ):
         """Initialize the Rhino client.
         
         Args:
             host: The hostname or IP address of the Rhino Bridge server
             port: The port number of the Rhino Bridge server
+            use_msgpack: Whether to send commands as MessagePack; by default
+                it is used when msgpack is installed. JSON is used instead if
+                the bridge cannot read MessagePack.
+            
+        Raises:
+            ImportError: If use_msgpack is True but msgpack is not installed
         """
+        if use_msgpack is None:
+            use_msgpack = msgpack is not None
+        elif use_msgpack and msgpack is None:
+            raise ImportError("msgpack is required for use_msgpack=True")
+        
         self.host = host
         self.port = port
+        self.content_type = CONTENT_MSGPACK if use_msgpack else CONTENT_JSON
         self.socket: Optional[socket.socket] = None
         self.connected = False
+        # Serializes request/response pairs when the client is shared
+        # between threads (e.g. the MCP server's executor workers)
+        self._lock = threading.Lock()
+        # Receive buffer; bytes in [_recv_start, _recv_end) are unread
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+        self._recv_start = 0
+        self._recv_end = 0
         
     def connect(self) -> bool:
         """Connect to the Rhino Bridge server.
@@ -57,6 +285,10 @@ class RhinoClient:
         """
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._recv_start = self._recv_end = 0
+            # Commands and responses are small request/response pairs;
+            # disable Nagle so they are not held back waiting for an ACK
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.socket.connect((self.host, self.port))
             self.connected = True
             print(f"Connected to Rhino Bridge at {self.host}:{self.port}")
@@ -71,6 +303,27 @@ class RhinoClient:
             self.connected = False
             raise ConnectionError(f"Connection error: {str(e)}")
     
+    def __enter__(self) -> 'RhinoClient':
+        """Connect on entering a with block, if not already connected.
+        
+        Returns:
+            The connected client
+            
+        Raises:
+            ConnectionError: If failed to connect to the server
+        """
+        if not self.connected:
+            self.connect()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Disconnect on leaving a with block.
+        
+        Returns:
+            None
+        """
+        self.disconnect()
+    
     def disconnect(self) -> None:
         """Disconnect from the Rhino Bridge server.
         
@@ -80,15 +333,29 @@ class RhinoClient:
         if self.socket:
             self.socket.close()
             self.socket = None
+        self._recv_start = self._recv_end = 0
         self.connected = False
         print("Disconnected from Rhino Bridge")
     
-    def send_command(self, cmd_type: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+    def send_command(
+        self,
+        cmd_type: str,
+        data: Dict[str, Any] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """Send a command to the Rhino Bridge server.
         
+        The server may answer with any number of partial-result frames
+        (status 'partial') before the final response; their data is passed
+        to on_partial as they arrive. If sending the command fails because
+        the connection was reset, the client reconnects and sends it once
+        more. A failure after the command was sent is not retried, as the
+        bridge may already have run it.
+        
         Args:
             cmd_type: The type of command to send
             data: The data to send with the command
+            on_partial: Callback for the data of each partial-result frame
             
         Returns:
             The response from the server as a dictionary
@@ -110,20 +377,201 @@ class RhinoClient:
                 'data': data
             }
             
-            # Send the command
-            self.socket.sendall(json.dumps(command).encode('utf-8'))
+            callback_error: Optional[BaseException] = None
+            with self._lock:
+                try:
+                    content_type = self.content_type
+                    response = self._exchange(command, content_type)
+                    if content_type != CONTENT_JSON and response.get('code') == 'unsupported_content_type':
+                        # The bridge cannot read this format; use JSON from now on
+                        self.content_type = CONTENT_JSON
+                        response = self._exchange(command, CONTENT_JSON)
+                    
+                    # Pass partial results on; frames are drained even if the
+                    # callback fails so the connection stays in sync
+                    while response.get('status') == 'partial':
+                        if on_partial is not None and callback_error is None:
+                            try:
+                                on_partial(response.get('data', {}))
+                            except Exception as e:
+                                callback_error = e
+                        response = _decode_message(*self._recv_frame())
+                except Exception:
+                    # A frame may be left half-read, so the connection can't
+                    # be trusted for the next command
+                    self.disconnect()
+                    raise
             
-            # Receive the response
-            response_data = self.socket.recv(4096)
-            if not response_data:
-                raise RuntimeError("No response from server")
-            
-            # Parse the response
-            response = json.loads(response_data.decode('utf-8'))
+            if callback_error is not None:
+                raise callback_error
             return response
         except Exception as e:
             raise RuntimeError(f"Command error: {str(e)}")
     
+    def _exchange(self, command: Dict[str, Any], content_type: int) -> Dict[str, Any]:
+        """Send a command and receive the first response frame.
+        
+        Args:
+            command: The command to send
+            content_type: The content type to send the command in
+            
+        Returns:
+            The decoded first response frame
+        """
+        payload = _encode_message(command, content_type)
+        if self._peer_closed():
+            # The bridge dropped the kept-alive connection since the last
+            # command (e.g. it was restarted); send on a fresh one instead
+            self._reconnect()
+        try:
+            self._send_frame(payload, content_type)
+        except _RESET_ERRORS:
+            # The bridge never got the whole command, so it did not run
+            self._reconnect()
+            self._send_frame(payload, content_type)
+        return _decode_message(*self._recv_frame())
+    
+    def _reconnect(self) -> None:
+        """Replace the current connection to the Rhino Bridge with a new one.
+        
+        Returns:
+            None
+        """
+        if self.socket:
+            self.socket.close()
+        self.connect()
+    
+    def _peer_closed(self) -> bool:
+        """Check, without blocking, whether the bridge has closed the connection.
+        
+        Peeks at the socket: an idle connection has nothing to read, while
+        one the bridge closed reads as end of file.
+        
+        Returns:
+            True if the connection was closed or reset by the bridge
+        """
+        sock = self.socket
+        if sock is None:
+            return True
+        try:
+            if _MSG_DONTWAIT:
+                return not sock.recv(1, _PEEK_FLAGS)
+            # No MSG_DONTWAIT (e.g. on Windows); make the peek non-blocking
+            sock.setblocking(False)
+            try:
+                return not sock.recv(1, _PEEK_FLAGS)
+            finally:
+                sock.setblocking(True)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            return True
+    
+    def _send_frame(self, payload: bytes, content_type: int) -> None:
+        """Send a payload as one length-prefixed frame.
+        
+        Where the platform has sendmsg, the header and payload go out in one
+        scatter-gather call without being concatenated first; otherwise
+        (e.g. on Windows) they are joined and sent with sendall.
+        
+        Args:
+            payload: The encoded message
+            content_type: The content type of the payload
+            
+        Returns:
+            None
+        """
+        sock = self.socket
+        if sock is None:
+            raise ConnectionError("Not connected to Rhino Bridge")
+        header = FRAME_HEADER.pack(len(payload), content_type)
+        sendmsg = getattr(sock, 'sendmsg', None)
+        if sendmsg is None:
+            sock.sendall(header + payload)
+            return
+        
+        sent = sendmsg([header, payload])
+        # A blocking sendmsg may still write only part of the frame
+        if sent < len(header):
+            sock.sendall(header[sent:] + payload)
+        elif sent < len(header) + len(payload):
+            sock.sendall(memoryview(payload)[sent - len(header):])
+    
+    def _recv_exact(self, size: int) -> bytearray:
+        """Receive exactly size bytes from the socket.
+        
+        Args:
+            size: The number of bytes to receive
+            
+        Returns:
+            The received bytes
+            
+        Raises:
+            ConnectionError: If the server closes the connection
+        """
+        sock = self.socket
+        if sock is None:
+            raise ConnectionError("Not connected to Rhino Bridge")
+        start, end = self._recv_start, self._recv_end
+        
+        if size > len(self._recv_buf):
+            # Too large for the buffer: take what is buffered, then read the
+            # rest straight into the result
+            buf = bytearray(size)
+            received = end - start
+            buf[:received] = self._recv_view[start:end]
+            self._recv_start = self._recv_end = 0
+            view = memoryview(buf)
+            while received < size:
+                count = sock.recv_into(view[received:])
+                if not count:
+                    raise ConnectionError("Connection closed by Rhino Bridge")
+                received += count
+            return buf
+        
+        if end - start < size:
+            if start + size > len(self._recv_buf):
+                # Move the unread bytes to the front to make room
+                self._recv_buf[:end - start] = self._recv_view[start:end]
+                start, end = 0, end - start
+            while end - start < size:
+                count = sock.recv_into(self._recv_view[end:])
+                if not count:
+                    self._recv_start, self._recv_end = start, end
+                    raise ConnectionError("Connection closed by Rhino Bridge")
+                end += count
+        
+        data = self._recv_buf[start:start + size]
+        start += size
+        if start == end:
+            start = end = 0
+        self._recv_start, self._recv_end = start, end
+        return data
+    
+    def _recv_frame(self) -> Tuple[int, bytearray]:
+        """Receive one length-prefixed (or chunked) frame from the socket.
+        
+        Returns:
+            The content type and payload of the frame
+            
+        Raises:
+            ConnectionError: If the server closes the connection
+            RuntimeError: If the frame size exceeds MAX_FRAME_SIZE
+        """
+        size, content_type = FRAME_HEADER.unpack(self._recv_exact(FRAME_HEADER.size))
+        if size == CHUNKED_FRAME:
+            payload = bytearray()
+            while True:
+                (size,) = CHUNK_HEADER.unpack(self._recv_exact(CHUNK_HEADER.size))
+                if not size:
+                    return content_type, payload
+                if len(payload) + size > MAX_FRAME_SIZE:
+                    raise RuntimeError(f"Response frame too large: over {MAX_FRAME_SIZE} bytes")
+                payload += self._recv_exact(size)
+        if size > MAX_FRAME_SIZE:
+            raise RuntimeError(f"Response frame too large: {size} bytes")
+        return content_type, self._recv_exact(size)
+    
     def ping(self) -> Dict[str, Any]:
         """Ping the Rhino Bridge server to check connection.
         
@@ -145,14 +593,77 @@ class RhinoClient:
             Response from the server including curve ID if successful
             
         Raises:
-            ValueError: If points list is invalid
+            ValueError: If points list is invalid or a coordinate is not finite
             ConnectionError: If not connected to the server
         """
         if not points or len(points) < 2:
             raise ValueError("At least 2 points are required to create a curve")
+        _check_points_finite(points)
             
         return self.send_command('create_curve', {'points': points})
     
+    def create_curve_binary(self, coords: Union[Sequence[float], Any]) -> Dict[str, Any]:
+        """Create a NURBS curve in Rhino from packed coordinates.
+        
+        The coordinates are sent as a little-endian float64 blob (raw bytes
+        over MessagePack, base64 text over JSON) instead of a JSON list of point objects, which keeps the
+        payload compact and avoids per-point encoding on both ends.
+        
+        Args:
+            coords: Flat sequence of coordinates (x0, y0, z0, x1, y1, z1, ...),
+                or any object exposing a contiguous float64 buffer, such as
+                an array('d') or an (N, 3) numpy array
+            
+        Returns:
+            Response from the server including curve ID if successful
+            
+        Raises:
+            ValueError: If fewer than 2 points are given or a coordinate is
+                not finite
+            ConnectionError: If not connected to the server
+        """
+        packed = _as_float64_le(coords)
+        if len(packed) % 3:
+            raise ValueError("Coordinate count must be a multiple of 3")
+        if len(packed) < 6:
+            raise ValueError("At least 2 points are required to create a curve")
+        _check_finite(packed)
+        
+        return self.send_command('create_curve', {'points_blob': packed.tobytes()})
+    
+    def create_curves(self, curves: Sequence[Sequence[Point3d]]) -> Dict[str, Any]:
+        """Create several NURBS curves in Rhino with one command.
+        
+        All points travel in one packed blob, and the curves are added as a
+        single undo step with one viewport redraw.
+        
+        Args:
+            curves: List of curves, each a list of points (dicts with x, y,
+                z keys)
+            
+        Returns:
+            Response from the server including the curve IDs if successful
+            
+        Raises:
+            ValueError: If no curves are given, a curve has fewer than 2
+                points or a coordinate is not finite
+            ConnectionError: If not connected to the server
+        """
+        if not curves:
+            raise ValueError("At least one curve is required")
+        
+        packed = array('d')
+        counts: List[int] = []
+        for points in curves:
+            if len(points) < 2:
+                raise ValueError("At least 2 points are required to create a curve")
+            packed.extend(pack_points(points))
+            counts.append(len(points))
+        
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return self.send_command('create_curves', {'points_blob': packed.tobytes(), 'counts': counts})
+    
     def refresh_view(self) -> Dict[str, Any]:
         """Refresh the Rhino viewport.
         
@@ -164,11 +675,13 @@ class RhinoClient:
         """
         return self.send_command('refresh_view')
     
-    def run_script(self, script: str) -> Dict[str, Any]:
+    def run_script(self, script: str, verbose: bool = False) -> Dict[str, Any]:
         """Run a Python script in Rhino's Python context.
         
         Args:
             script: The Python script to run
+            verbose: Whether the traceback of a failed script is sent back
+                (formatting it costs a walk of the script's stack)
             
         Returns:
             Response from the server including script result
@@ -180,7 +693,54 @@ class RhinoClient:
         if not script:
             raise ValueError("Script cannot be empty")
             
-        return self.send_command('run_script', {'script': script})
+        return self.send_command('run_script', {'script': script, 'verbose': verbose})
+    
+    def run_script_stream(
+        self, script: str, callback: Callable[[str], None], verbose: bool = False
+    ) -> Dict[str, Any]:
+        """Run a Python script in Rhino, streaming its printed output.
+        
+        Args:
+            script: The Python script to run
+            callback: Called with each chunk of output as it arrives
+            verbose: Whether the traceback of a failed script is sent back
+                (formatting it costs a walk of the script's stack)
+            
+        Returns:
+            Response from the server including script result
+            
+        Raises:
+            ValueError: If script is empty
+            ConnectionError: If not connected to the server
+        """
+        if not script:
+            raise ValueError("Script cannot be empty")
+        
+        return self.send_command(
+            'run_script',
+            {'script': script, 'stream': True, 'verbose': verbose},
+            on_partial=lambda data: callback(data.get('chunk', ''))
+        )
+
+
+def get_default() -> RhinoClient:
+    """Get the calling thread's persistent client, connecting it if needed.
+    
+    Repeated calls from the same thread reuse one connection, so scripts
+    issuing many commands pay for a single TCP handshake.
+    
+    Returns:
+        The connected default client for the current thread
+        
+    Raises:
+        ConnectionError: If failed to connect to the server
+    """
+    client = getattr(_default_clients, 'client', None)
+    if client is None:
+        client = _default_clients.client = RhinoClient()
+    if not client.connected:
+        client.connect()
+    return client
 
 
 def test_connection(host: str = '127.0.0.1', port: int = 8888) -> bool:
@@ -6,13 +6,36 @@ allows external Python processes to communicate with and control Rhino.
 
 Version: 1.0 (2025-03-13)
 """
-from typing import Dict, Any, Optional, List, Tuple, Union
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable, Iterator
 import socket
 import json
 import sys
 import traceback
-import threading
+import contextlib
+import asyncio
+import errno
+import hashlib
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import CodeType
 import time
+import base64
+import struct
+from array import array
+
+# orjson and msgpack are optional: use them when Rhino's Python has them
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack  # type: ignore[import]
+except ImportError:
+    msgpack = None
 
 # Import Rhino-specific modules
 try:
@@ -27,6 +50,80 @@ HOST = '127.0.0.1'
 PORT = 8888
 SERVER_VERSION = "RhinoMCP-1.0"
 SERVER_START_TIME = time.strftime("%Y-%m-%d %H:%M:%S")
+LOG_LEVEL = logging.INFO
+# Pending-connection queue; lets bursts of short-lived clients (one per
+# script) wait for accept instead of being refused
+LISTEN_BACKLOG = 128
+
+# Records are queued by the serving threads and written to the console by a
+# background listener started in start_server(), so no request waits on
+# console I/O
+logger = logging.getLogger("rhino_plugin")
+
+# Wire framing: every message is a 4-byte big-endian payload length and a
+# 1-byte content type, followed by the payload
+FRAME_HEADER = struct.Struct('>IB')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Payload content types; replies use the content type of the command
+CONTENT_JSON = 0x01
+CONTENT_MSGPACK = 0x02
+SUPPORTED_CONTENT_TYPES = (CONTENT_JSON, CONTENT_MSGPACK) if msgpack is not None else (CONTENT_JSON,)
+
+# A length of CHUNKED_FRAME announces a message sent as a series of chunks,
+# each with a 4-byte big-endian length, ended by a zero-length chunk; used
+# when a large message is encoded incrementally
+CHUNKED_FRAME = 0xFFFFFFFF
+CHUNK_HEADER = struct.Struct('>I')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Single worker thread for Rhino API calls, so document access is serialized
+# and never blocks the event loop serving the sockets
+RHINO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rhino')
+
+# Compiled run_script code keyed by a hash of the source, least recently
+# used first; only touched from RHINO_EXECUTOR's thread
+SCRIPT_CACHE_SIZE = 256
+_script_cache: 'OrderedDict[bytes, CodeType]' = OrderedDict()
+
+# Ping fields that do not change while the server runs, built on first ping
+_ping_info: Optional[Dict[str, Any]] = None
+
+
+# Converter for each non-JSON type seen so far, so the type is probed once
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _collection_to_list(obj: Any) -> Any:
+    """Convert an iterable .NET collection to a list, or a string if it is not."""
+    try:
+        return list(obj)
+    except TypeError:
+        return str(obj)
+
+
+def encode_default(obj: Any) -> Any:
+    """Convert an object the JSON encoder cannot handle.
+    
+    Collections (objects with Count and Item, e.g. .NET lists) become lists
+    whose items the encoder converts in turn; anything else, like .NET
+    Version or Guid objects, becomes its string form.
+    
+    Args:
+        obj: The object to convert
+        
+    Returns:
+        A JSON-serializable replacement for the object
+    """
+    obj_type = type(obj)
+    converter = _CONVERTERS.get(obj_type)
+    if converter is None:
+        if hasattr(obj, 'Count') and hasattr(obj, 'Item'):
+            converter = _collection_to_list
+        else:
+            converter = str
+        _CONVERTERS[obj_type] = converter
+    return converter(obj)
 
 
 class RhinoEncoder(json.JSONEncoder):
@@ -39,175 +136,752 @@ class RhinoEncoder(json.JSONEncoder):
         Encoded JSON string
     """
     def default(self, obj: Any) -> Any:
-        # Handle .NET Version objects and other common types
+        return encode_default(obj)
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as UTF-8 JSON.
+    
+    Uses orjson when available, converting Rhino and .NET objects with
+    encode_default, and falls back to RhinoEncoder for anything else orjson
+    rejects (e.g. integers wider than 64 bits).
+    
+    Args:
+        message: The message to encode
+        
+    Returns:
+        The encoded message
+    """
+    if orjson is not None:
         try:
-            if hasattr(obj, 'ToString'):
-                return str(obj)
-            elif hasattr(obj, 'Count') and hasattr(obj, 'Item'):
-                return [self.default(obj.Item[i]) for i in range(obj.Count)]
-            else:
-                return str(obj)  # Last resort: convert anything to string
-        except:
-            return str(obj)  # Absolute fallback
+            return orjson.dumps(message, default=encode_default)
+        except TypeError:
+            pass
+    return json.dumps(message, cls=RhinoEncoder).encode('utf-8')
+
+
+def decode_message(data: bytes, content_type: int = CONTENT_JSON) -> Any:
+    """Decode a UTF-8 JSON or MessagePack message.
+    
+    Args:
+        data: The encoded message
+        content_type: The content type of the message, one of
+            SUPPORTED_CONTENT_TYPES
+        
+    Returns:
+        The decoded message
+        
+    Raises:
+        ValueError: If the data is not a valid message
+    """
+    if content_type == CONTENT_MSGPACK:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Tuple[int, bytes]]:
+    """Read one length-prefixed (or chunked) frame from a client stream.
+    
+    Args:
+        reader: Stream reader of the client connection
+        
+    Returns:
+        The content type and payload of the frame, or None if the client
+        disconnected cleanly
+        
+    Raises:
+        ConnectionError: If the client disconnects mid-frame
+        ValueError: If the frame size exceeds MAX_FRAME_SIZE
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ConnectionError("Connection closed mid-frame")
+    size, content_type = FRAME_HEADER.unpack(header)
+    try:
+        if size == CHUNKED_FRAME:
+            payload = bytearray()
+            while True:
+                (size,) = CHUNK_HEADER.unpack(await reader.readexactly(CHUNK_HEADER.size))
+                if not size:
+                    return content_type, bytes(payload)
+                if len(payload) + size > MAX_FRAME_SIZE:
+                    raise ValueError(f"Frame too large: over {MAX_FRAME_SIZE} bytes")
+                payload += await reader.readexactly(size)
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame too large: {size} bytes")
+        return content_type, await reader.readexactly(size)
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("Connection closed mid-frame")
+
+
+def write_frame(
+    writer: asyncio.StreamWriter, payload: bytes, content_type: int = CONTENT_JSON
+) -> None:
+    """Queue a payload on a client stream as one length-prefixed frame.
+    
+    The header and payload are handed over as separate buffers so the
+    payload is never copied into a concatenated frame.
+    
+    Args:
+        writer: Stream writer of the client connection
+        payload: The encoded message
+        content_type: The content type of the payload
+        
+    Returns:
+        None
+    """
+    writer.writelines((FRAME_HEADER.pack(len(payload), content_type), payload))
+
+
+def write_chunk(writer: asyncio.StreamWriter, payload: bytes) -> None:
+    """Queue one chunk of a chunked frame on a client stream.
+    
+    Args:
+        writer: Stream writer of the client connection
+        payload: The chunk; empty to end the frame
+        
+    Returns:
+        None
+    """
+    writer.writelines((CHUNK_HEADER.pack(len(payload)), payload))
+
+
+def decode_points_blob(points_blob: Union[str, bytes]) -> array:
+    """Decode packed point coordinates.
+    
+    Args:
+        points_blob: Little-endian float64 coordinates, x, y, z for every
+            point; raw bytes in MessagePack commands, base64 in JSON ones
+        
+    Returns:
+        The flat coordinates
+        
+    Raises:
+        ValueError: If the blob does not hold whole points
+    """
+    coords = array('d')
+    coords.frombytes(base64.b64decode(points_blob) if isinstance(points_blob, str) else points_blob)
+    if sys.byteorder == 'big':
+        coords.byteswap()
+    if len(coords) % 3:
+        raise ValueError("points_blob must hold x, y, z for every point")
+    return coords
+
+
+def build_point_list(coords: array, start: int, end: int) -> Any:
+    """Build a Point3dList from a slice of flat coordinates.
+    
+    Args:
+        coords: The flat coordinates
+        start: Index of the first coordinate of the first point
+        end: Index one past the last coordinate of the last point
+        
+    Returns:
+        A presized Rhino.Collections.Point3dList of the points
+    """
+    points = Rhino.Collections.Point3dList((end - start) // 3)
+    add_point = points.Add
+    for i in range(start, end, 3):
+        add_point(coords[i], coords[i + 1], coords[i + 2])
+    return points
+
+
+def error_result(message: str, cmd_data: Any) -> Dict[str, Any]:
+    """Build the result for a failed command.
+    
+    Must be called from the except block handling the error. The
+    traceback is only formatted when the command asked for verbose errors.
+    
+    Args:
+        message: The error message
+        cmd_data: The data sent with the command, which may not be an object
         
-        # Let the base class handle other types
-        return super(RhinoEncoder, self).default(obj)
+    Returns:
+        The error result
+    """
+    result: Dict[str, Any] = {'status': 'error', 'message': message}
+    if isinstance(cmd_data, dict) and cmd_data.get('verbose'):
+        result['traceback'] = traceback.format_exc()
+    return result
+
+
+def _get_ping_info() -> Dict[str, Any]:
+    """Get the static part of the ping response.
+    
+    Reading the Rhino version crosses into .NET, so it is done once.
+    
+    Returns:
+        The Rhino and server version information
+    """
+    global _ping_info
+    if _ping_info is None:
+        _ping_info = {
+            'version': str(Rhino.RhinoApp.Version),
+            'server_version': SERVER_VERSION,
+            'server_start_time': SERVER_START_TIME,
+            'script_path': __file__
+        }
+    return _ping_info
 
 
-def handle_client(conn: socket.socket, addr: Tuple[str, int]) -> None:
+@contextlib.contextmanager
+def _suspend_redraw(doc: Any) -> Iterator[None]:
+    """Suspend viewport redraws for the duration of a block.
+    
+    Restores the previous redraw setting and redraws the views once on
+    exit, so document changes made in the block cost a single refresh.
+    
+    Args:
+        doc: The Rhino document
+        
+    Returns:
+        Context manager for the block
+    """
+    views = doc.Views
+    redraw_enabled = views.RedrawEnabled
+    views.RedrawEnabled = False
+    try:
+        yield
+    finally:
+        views.RedrawEnabled = redraw_enabled
+        views.Redraw()
+
+
+def compile_script(script: str) -> CodeType:
+    """Compile a run_script source, reusing the code of repeated scripts.
+    
+    Args:
+        script: The Python script source
+        
+    Returns:
+        The compiled code object
+        
+    Raises:
+        SyntaxError: If the script does not compile
+    """
+    key = hashlib.blake2b(script.encode('utf-8'), digest_size=16).digest()
+    code = _script_cache.get(key)
+    if code is not None:
+        _script_cache.move_to_end(key)
+        return code
+    
+    code = compile(script, '<mcp-script>', 'exec')
+    _script_cache[key] = code
+    if len(_script_cache) > SCRIPT_CACHE_SIZE:
+        _script_cache.popitem(last=False)
+    return code
+
+
+async def write_message(
+    writer: asyncio.StreamWriter, message: Dict[str, Any], content_type: int = CONTENT_JSON
+) -> None:
+    """Encode a message and send it to a client.
+    
+    MessagePack is used if the client asked for it and the message packs;
+    otherwise the message is sent as JSON. With orjson the JSON is encoded
+    in one go. Otherwise it is encoded incrementally with RhinoEncoder;
+    once the output passes STREAM_CHUNK_SIZE it is sent as a chunked frame,
+    so a large result is never held fully encoded in memory.
+    
+    A message that cannot be encoded is answered with an error response
+    instead, unless part of its chunked frame has already been sent.
+    
+    Args:
+        writer: Stream writer of the client connection
+        message: The message to send
+        content_type: The content type the client asked for
+        
+    Returns:
+        None
+        
+    Raises:
+        ConnectionError: If the message fails to encode after its chunked
+            frame was started; the connection can no longer be used
+    """
+    if content_type == CONTENT_MSGPACK:
+        try:
+            payload = msgpack.packb(message, default=encode_default, use_bin_type=True)
+            write_frame(writer, payload, CONTENT_MSGPACK)
+            return
+        except (TypeError, ValueError, OverflowError):
+            # Not representable in MessagePack (e.g. huge integers)
+            pass
+    
+    if orjson is not None:
+        try:
+            write_frame(writer, orjson.dumps(message, default=encode_default))
+            return
+        except TypeError:
+            pass
+    
+    parts: List[str] = []
+    pending = 0
+    chunked = False
+    try:
+        for part in RhinoEncoder().iterencode(message):
+            parts.append(part)
+            pending += len(part)
+            if pending >= STREAM_CHUNK_SIZE:
+                if not chunked:
+                    writer.write(FRAME_HEADER.pack(CHUNKED_FRAME, CONTENT_JSON))
+                    chunked = True
+                write_chunk(writer, ''.join(parts).encode('utf-8'))
+                parts.clear()
+                pending = 0
+                await writer.drain()
+    except ValueError as e:
+        # Not encodable (e.g. a circular reference)
+        if chunked:
+            # Part of the frame is already out and cannot be taken back;
+            # the connection has to be dropped to keep the client in sync
+            raise ConnectionError(f"Failed to encode response mid-frame: {e}")
+        write_frame(writer, encode_message({
+            'status': 'error',
+            'message': f'Failed to encode result: {e}'
+        }))
+        return
+    
+    payload = ''.join(parts).encode('utf-8')
+    if not chunked:
+        write_frame(writer, payload)
+        return
+    if payload:
+        write_chunk(writer, payload)
+    write_chunk(writer, b'')
+
+
+class FrameWriter:
+    """File-like object that streams written text to a client.
+    
+    Text is buffered per line and each flush is sent as a partial-result
+    frame ({'status': 'partial', 'data': {'chunk': ...}}) ahead of the
+    command's final response.
+    
+    Args:
+        send: Callable that sends one encoded frame payload to the client
+    """
+    def __init__(self, send: Callable[[bytes], None]) -> None:
+        self.send = send
+        self._pending = ''
+    
+    def write(self, text: str) -> int:
+        self._pending += text
+        if '\n' in text:
+            self.flush()
+        return len(text)
+    
+    def flush(self) -> None:
+        if self._pending:
+            chunk, self._pending = self._pending, ''
+            self.send(encode_message({
+                'status': 'partial',
+                'data': {'chunk': chunk}
+            }))
+
+
+def _do_ping(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Report that Rhino is connected, with version and document info.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    return {
+        'status': 'success',
+        'message': 'Rhino is connected',
+        'data': {
+            **_get_ping_info(),
+            'has_active_doc': Rhino.RhinoDoc.ActiveDoc is not None
+        }
+    }
+
+
+def _do_create_curve(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Create one interpolated curve from a points list or blob.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    try:
+        points_blob = cmd_data.get('points_blob')
+        if points_blob is not None:
+            coords = decode_points_blob(points_blob)
+            
+            # Check if we have enough points for a curve
+            if len(coords) < 6:
+                raise ValueError("At least 2 points are required to create a curve")
+            
+            points = build_point_list(coords, 0, len(coords))
+        else:
+            # Extract points from the command data
+            points_data = cmd_data.get('points', [])
+            
+            # Check if we have enough points for a curve
+            if len(points_data) < 2:
+                raise ValueError("At least 2 points are required to create a curve")
+            
+            # Convert point data to Rhino points
+            Point3d = Rhino.Geometry.Point3d
+            points = [
+                Point3d(pt.get('x', 0.0), pt.get('y', 0.0), pt.get('z', 0.0))
+                for pt in points_data
+            ]
+        
+        # Create the curve
+        doc = Rhino.RhinoDoc.ActiveDoc
+        if not doc:
+            raise Exception("No active Rhino document")
+        
+        # Create a NURBS curve
+        curve = Rhino.Geometry.Curve.CreateInterpolatedCurve(points, 3)
+        
+        if not curve:
+            raise Exception("Failed to create curve")
+        
+        # Add to document; the view is updated once the add is done
+        with _suspend_redraw(doc):
+            id = doc.Objects.AddCurve(curve)
+        
+        return {
+            'status': 'success',
+            'message': f'Curve created with {len(points)} points',
+            'data': {
+                'id': str(id),
+                'point_count': len(points)
+            }
+        }
+    except Exception as e:
+        return error_result(f'Curve creation error: {str(e)}', cmd_data)
+
+
+def _do_create_curves(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Create several interpolated curves as one undo step.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    try:
+        doc = Rhino.RhinoDoc.ActiveDoc
+        if not doc:
+            raise Exception("No active Rhino document")
+        
+        # Collect the points of every curve
+        points_blob = cmd_data.get('points_blob')
+        if points_blob is not None:
+            # One blob for all curves, split by the per-curve point counts
+            coords = decode_points_blob(points_blob)
+            counts = cmd_data.get('counts', [])
+            if sum(counts) * 3 != len(coords):
+                raise ValueError("counts do not match the points in points_blob")
+            
+            curve_points = []
+            start = 0
+            for count in counts:
+                end = start + count * 3
+                curve_points.append(build_point_list(coords, start, end))
+                start = end
+        else:
+            Point3d = Rhino.Geometry.Point3d
+            curve_points = [
+                [Point3d(pt.get('x', 0.0), pt.get('y', 0.0), pt.get('z', 0.0)) for pt in points_data]
+                for points_data in cmd_data.get('curves', [])
+            ]
+        
+        if not curve_points:
+            raise ValueError("At least one curve is required")
+        
+        # Build every curve before touching the document
+        curves: List[Any] = []
+        for points in curve_points:
+            if len(points) < 2:
+                raise ValueError("At least 2 points are required to create a curve")
+            curve = Rhino.Geometry.Curve.CreateInterpolatedCurve(points, 3)
+            if not curve:
+                raise Exception(f"Failed to create curve {len(curves)}")
+            curves.append(curve)
+        
+        # Add them as a single undo step and redraw once for the batch
+        with _suspend_redraw(doc):
+            undo_record = doc.BeginUndoRecord("Create curves")
+            try:
+                ids = [str(doc.Objects.AddCurve(curve)) for curve in curves]
+            finally:
+                doc.EndUndoRecord(undo_record)
+        
+        return {
+            'status': 'success',
+            'message': f'{len(ids)} curves created',
+            'data': {
+                'ids': ids,
+                'count': len(ids)
+            }
+        }
+    except Exception as e:
+        return error_result(f'Curve creation error: {str(e)}', cmd_data)
+
+
+def _do_refresh_view(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Redraw the views of the active document.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    try:
+        doc = Rhino.RhinoDoc.ActiveDoc
+        if not doc:
+            raise Exception("No active Rhino document")
+        
+        doc.Views.Redraw()
+        return {
+            'status': 'success',
+            'message': 'View refreshed'
+        }
+    except Exception as e:
+        return {
+            'status': 'error', 
+            'message': f'View refresh error: {str(e)}'
+        }
+
+
+def _do_run_script(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Run a Python script in Rhino, optionally streaming its output.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    try:
+        script = cmd_data.get('script', '')
+        if not script:
+            raise ValueError("Empty script")
+        
+        # Execute the script in Rhino's Python context
+        code = compile_script(script)
+        locals_dict = {}
+        if cmd_data.get('stream'):
+            # Stream the script's printed output to the client
+            writer = FrameWriter(send_partial)
+            try:
+                with contextlib.redirect_stdout(writer):
+                    exec(code, globals(), locals_dict)
+            finally:
+                writer.flush()
+        else:
+            exec(code, globals(), locals_dict)
+        
+        # Return the result if available
+        script_result = locals_dict.get('result', None)
+        return {
+            'status': 'success',
+            'message': 'Script executed successfully',
+            'data': {
+                'result': script_result
+            }
+        }
+    except Exception as e:
+        return error_result(f'Script execution error: {str(e)}', cmd_data)
+
+
+def _do_unknown(cmd_data: Dict[str, Any], send_partial: Callable[[bytes], None]) -> Dict[str, Any]:
+    """Answer a command type that has no handler.
+    
+    Args:
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    return {'status': 'error', 'message': 'Unknown command'}
+
+
+# A command handler takes the command data and a partial-result sender and
+# returns the command result
+CommandHandler = Callable[[Dict[str, Any], Callable[[bytes], None]], Dict[str, Any]]
+
+# Command handlers by command type; other modules can register more with
+# _HANDLERS['name'] = handler
+_HANDLERS: Dict[str, CommandHandler] = {
+    'ping': _do_ping,
+    'create_curve': _do_create_curve,
+    'create_curves': _do_create_curves,
+    'refresh_view': _do_refresh_view,
+    'run_script': _do_run_script,
+}
+
+
+def process_command(
+    cmd_type: Any,
+    cmd_data: Dict[str, Any],
+    send_partial: Callable[[bytes], None]
+) -> Dict[str, Any]:
+    """Run one command against Rhino.
+    
+    Called on RHINO_EXECUTOR so all Rhino API calls happen on one thread,
+    in the order the commands arrived.
+    
+    Args:
+        cmd_type: The type of the command, as sent by the client
+        cmd_data: The data sent with the command
+        send_partial: Callable that sends a partial-result frame payload
+        
+    Returns:
+        The command result
+    """
+    # The type comes from the client as-is; an unhashable one (a list, say)
+    # can't be looked up
+    if not isinstance(cmd_type, str):
+        return _do_unknown(cmd_data, send_partial)
+    return _HANDLERS.get(cmd_type, _do_unknown)(cmd_data, send_partial)
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
     """Handle individual client connections.
     
     Args:
-        conn: Socket connection object
-        addr: Client address tuple (host, port)
+        reader: Stream reader of the client connection
+        writer: Stream writer of the client connection
         
     Returns:
         None
     """
-    print(f"Connection established from {addr}")
+    addr = writer.get_extra_info('peername')
+    logger.info("Connection established from %s", addr)
+    loop = asyncio.get_running_loop()
+    
+    # Partial results are produced on the Rhino thread; hand them to the loop.
+    # They are queued ahead of the executor's completion callback, so they
+    # always reach the client before the final response.
+    def send_partial(payload: bytes) -> None:
+        loop.call_soon_threadsafe(write_frame, writer, payload)
     
     try:
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            # Replies are small; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
         while True:
             # Receive command
-            data = conn.recv(4096)
-            if not data:
+            frame = await read_frame(reader)
+            if frame is None:
                 break
+            content_type, data = frame
+            
+            if content_type not in SUPPORTED_CONTENT_TYPES:
+                # Answered in JSON, which every client understands
+                write_frame(writer, encode_message({
+                    'status': 'error',
+                    'message': f'Unsupported content type: {content_type}',
+                    'code': 'unsupported_content_type'
+                }))
+                await writer.drain()
+                continue
                 
             # Parse the command
             try:
-                command_obj = json.loads(data.decode('utf-8'))
-                cmd_type = command_obj.get('type', '')
-                cmd_data = command_obj.get('data', {})
-                
-                print(f"Received command: {cmd_type}")
-                result: Dict[str, Any] = {'status': 'error', 'message': 'Unknown command'}
-                
-                # Process different command types
-                if cmd_type == 'ping':
-                    result = {
-                        'status': 'success',
-                        'message': 'Rhino is connected',
-                        'data': {
-                            'version': str(Rhino.RhinoApp.Version),
-                            'has_active_doc': Rhino.RhinoDoc.ActiveDoc is not None,
-                            'server_version': SERVER_VERSION,
-                            'server_start_time': SERVER_START_TIME,
-                            'script_path': __file__
-                        }
-                    }
-                
-                elif cmd_type == 'create_curve':
-                    try:
-                        # Extract points from the command data
-                        points_data = cmd_data.get('points', [])
-                        
-                        # Check if we have enough points for a curve
-                        if len(points_data) < 2:
-                            raise ValueError("At least 2 points are required to create a curve")
-                            
-                        # Convert point data to Rhino points
-                        points = []
-                        for pt in points_data:
-                            x = pt.get('x', 0.0)
-                            y = pt.get('y', 0.0)
-                            z = pt.get('z', 0.0)
-                            points.append(Rhino.Geometry.Point3d(x, y, z))
-                        
-                        # Create the curve
-                        doc = Rhino.RhinoDoc.ActiveDoc
-                        if not doc:
-                            raise Exception("No active Rhino document")
-                            
-                        # Create a NURBS curve
-                        curve = Rhino.Geometry.Curve.CreateInterpolatedCurve(points, 3)
-                        
-                        if not curve:
-                            raise Exception("Failed to create curve")
-                            
-                        # Add to document
-                        id = doc.Objects.AddCurve(curve)
-                        
-                        # Force view update
-                        doc.Views.Redraw()
-                        
-                        result = {
-                            'status': 'success',
-                            'message': f'Curve created with {len(points)} points',
-                            'data': {
-                                'id': str(id),
-                                'point_count': len(points)
-                            }
-                        }
-                    except Exception as e:
-                        result = {
-                            'status': 'error', 
-                            'message': f'Curve creation error: {str(e)}',
-                            'traceback': traceback.format_exc()
-                        }
-                
-                elif cmd_type == 'refresh_view':
-                    try:
-                        doc = Rhino.RhinoDoc.ActiveDoc
-                        if not doc:
-                            raise Exception("No active Rhino document")
-                        
-                        doc.Views.Redraw()
-                        result = {
-                            'status': 'success',
-                            'message': 'View refreshed'
-                        }
-                    except Exception as e:
-                        result = {
-                            'status': 'error', 
-                            'message': f'View refresh error: {str(e)}'
-                        }
-                
-                elif cmd_type == 'run_script':
-                    try:
-                        script = cmd_data.get('script', '')
-                        if not script:
-                            raise ValueError("Empty script")
-                        
-                        # Execute the script in Rhino's Python context
-                        locals_dict = {}
-                        exec(script, globals(), locals_dict)
-                        
-                        # Return the result if available
-                        script_result = locals_dict.get('result', None)
-                        result = {
-                            'status': 'success',
-                            'message': 'Script executed successfully',
-                            'data': {
-                                'result': script_result
-                            }
-                        }
-                    except Exception as e:
-                        result = {
-                            'status': 'error', 
-                            'message': f'Script execution error: {str(e)}',
-                            'traceback': traceback.format_exc()
-                        }
-                
-                # Send the result back to the client
-                response = json.dumps(result, cls=RhinoEncoder)
-                conn.sendall(response.encode('utf-8'))
-                
-            except json.JSONDecodeError:
-                conn.sendall(json.dumps({
+                command_obj = decode_message(data, content_type)
+                if not isinstance(command_obj, dict):
+                    raise ValueError("Command is not an object")
+            except ValueError:
+                # Undecodable JSON or MessagePack (including UnicodeDecodeError
+                # and JSONDecodeError, both ValueErrors)
+                write_frame(writer, encode_message({
                     'status': 'error',
-                    'message': 'Invalid JSON format'
-                }).encode('utf-8'))
+                    'message': 'Invalid message format'
+                }))
+                await writer.drain()
+                continue
+            
+            cmd_type = command_obj.get('type', '')
+            cmd_data = command_obj.get('data', {})
+            
+            logger.debug("Received command: %s", cmd_type)
+            result = await loop.run_in_executor(
+                RHINO_EXECUTOR, process_command, cmd_type, cmd_data, send_partial
+            )
+            
+            # Send the result back to the client
+            await write_message(writer, result, content_type)
+            await writer.drain()
                 
-    except Exception as e:
-        print(f"Connection error: {str(e)}")
+    except (OSError, ValueError) as e:
+        # Socket failures and oversized frames end the connection; anything
+        # else is a bug and is left to the event loop's exception handler
+        logger.error("Connection error: %s", e)
     finally:
-        print(f"Connection closed with {addr}")
-        conn.close()
+        logger.info("Connection closed with %s", addr)
+        writer.close()
+
+
+async def serve() -> None:
+    """Accept client connections until cancelled.
+    
+    Returns:
+        None
+        
+    Raises:
+        OSError: If the server fails to bind
+    """
+    server = await asyncio.start_server(
+        handle_client, HOST, PORT, reuse_address=True, backlog=LISTEN_BACKLOG
+    )
+    logger.info("Rhino Bridge started! Listening on %s:%s", HOST, PORT)
+    logger.info("Server version: %s", SERVER_VERSION)
+    logger.info("Start time: %s", SERVER_START_TIME)
+    
+    async with server:
+        await server.serve_forever()
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """Route the bridge's log records through a queue to the console.
+    
+    Returns:
+        The started listener writing queued records to stdout
+    """
+    log_queue: 'queue.SimpleQueue[logging.LogRecord]' = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    return listener
 
 
 def start_server() -> None:
     """Start the socket server.
     
+    Runs an asyncio event loop on the calling thread; every client is a
+    coroutine on that loop rather than a thread of its own.
+    
     Args:
         None
         
@@ -217,30 +891,18 @@ def start_server() -> None:
     Raises:
         OSError: If the server fails to start
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        try:
-            s.bind((HOST, PORT))
-            s.listen(5)
-            print(f"Rhino Bridge started! Listening on {HOST}:{PORT}")
-            print(f"Server version: {SERVER_VERSION}")
-            print(f"Start time: {SERVER_START_TIME}")
-            
-            while True:
-                conn, addr = s.accept()
-                # Handle each client in a separate thread
-                client_thread = threading.Thread(target=handle_client, args=(conn, addr))
-                client_thread.daemon = True
-                client_thread.start()
-                
-        except OSError as e:
-            if e.errno == 10048:  # Address already in use
-                print("Error: Address already in use. Is the Rhino Bridge already running?")
-            else:
-                print(f"Socket error: {str(e)}")
-        except Exception as e:
-            print(f"Server error: {str(e)}")
-            traceback.print_exc()
+    listener = _start_logging()
+    try:
+        asyncio.run(serve())
+    except OSError as e:
+        if e.errno in (errno.EADDRINUSE, 10048):  # Address already in use
+            logger.error("Error: Address already in use. Is the Rhino Bridge already running?")
+        else:
+            logger.error("Socket error: %s", e)
+    except Exception as e:
+        logger.exception("Server error: %s", e)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
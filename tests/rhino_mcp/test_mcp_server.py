@@ -0,0 +1,238 @@
+"""Tests for the MCP server module."""
+from typing import Dict, Any, List, Optional
+import asyncio
+import json
+import logging
+import socket
+import time
+import pytest
+
+from rhino_mcp.mcp_server import RhinoMCPServer, BATCH_ENVELOPE, parse_args, _parse_args_full
+
+
+class FakeRhinoClient:
+    """Stand-in for RhinoClient that answers without a Rhino Bridge."""
+    
+    def __init__(self) -> None:
+        """Initialize fake client."""
+        self.connected = True
+        self.scripts: List[str] = []
+    
+    def connect(self) -> bool:
+        """Connect after a short delay, as a real connection attempt takes."""
+        time.sleep(0.01)
+        self.connected = True
+        return True
+    
+    def ping(self) -> Dict[str, Any]:
+        """Answer a ping."""
+        return {'status': 'success', 'message': 'Rhino is connected', 'data': {'version': '8.0.0'}}
+    
+    def run_script(self, script: str, verbose: bool = False) -> Dict[str, Any]:
+        """Record a script and report success."""
+        self.scripts.append(script)
+        return {'status': 'success', 'data': {'result': 42}}
+    
+    def run_script_stream(self, script: str, callback: Any, verbose: bool = False) -> Dict[str, Any]:
+        """Record a script, stream two chunks of output and report success."""
+        self.scripts.append(script)
+        callback('line 0\n')
+        callback('line 1\n')
+        return {'status': 'success', 'data': {'result': 2}}
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that yields queued messages and records sends."""
+    
+    def __init__(self, messages: List[str]) -> None:
+        """Initialize fake websocket."""
+        self.messages = messages
+        self.sent: List[Dict[str, Any]] = []
+        self.remote_address = ('127.0.0.1', 12345)
+    
+    def __aiter__(self) -> 'FakeWebSocket':
+        return self
+    
+    async def __anext__(self) -> str:
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+    
+    async def send(self, message: str) -> None:
+        """Record a sent message."""
+        self.sent.append(json.loads(message))
+    
+    async def close(self, code: int = 1000, reason: str = '') -> None:
+        """Mock close method."""
+        pass
+
+
+@pytest.fixture
+def server() -> RhinoMCPServer:
+    """Create a server whose Rhino client is a FakeRhinoClient."""
+    mcp = RhinoMCPServer()
+    mcp.rhino_client = FakeRhinoClient()
+    return mcp
+
+
+def call(server: RhinoMCPServer, request: Dict[str, Any], notify: Optional[Any] = None) -> Dict[str, Any]:
+    """Run handle_jsonrpc on a fresh event loop."""
+    return asyncio.run(server.handle_jsonrpc(request, notify))
+
+
+def test_handle_jsonrpc_errors(server: RhinoMCPServer) -> None:
+    """Test handle_jsonrpc answers malformed requests with JSON-RPC errors."""
+    # Test a method that is not a string
+    response = call(server, {'jsonrpc': '2.0', 'id': 1, 'method': 5})
+    assert response['error']['code'] == -32600
+    assert response['id'] == 1
+    
+    # Test an unknown method
+    response = call(server, {'jsonrpc': '2.0', 'id': 2, 'method': 'nope'})
+    assert response['error']['code'] == -32601
+    
+    # Test params that are not an object
+    response = call(server, {'jsonrpc': '2.0', 'id': 3, 'method': 'rhino_ping', 'params': [1]})
+    assert response['error']['code'] == -32602
+    
+    # Test a tool that raises is reported as a tool error
+    response = call(server, {
+        'jsonrpc': '2.0', 'id': 4, 'method': 'rhino_run_script', 'params': {'script': ''}
+    })
+    assert response['error']['code'] == -32000
+    assert 'empty' in response['error']['message']
+
+
+def test_handle_jsonrpc_tool_call(server: RhinoMCPServer) -> None:
+    """Test handle_jsonrpc dispatches tool calls and discovery."""
+    response = call(server, {'jsonrpc': '2.0', 'id': 1, 'method': 'rhino_ping'})
+    assert response['result']['success'] is True
+    assert response['result']['data']['version'] == '8.0.0'
+    
+    response = call(server, {'jsonrpc': '2.0', 'id': 2, 'method': 'rpc.discover'})
+    names = [tool['name'] for tool in response['result']['functions']]
+    assert 'rhino_create_curve' in names
+
+
+def test_handle_jsonrpc_streams_partials(server: RhinoMCPServer) -> None:
+    """Test handle_jsonrpc forwards streamed output as partial notifications."""
+    notifications: List[Any] = []
+    
+    async def notify(method: str, params: Dict[str, Any]) -> None:
+        notifications.append((method, params))
+    
+    response = call(server, {
+        'jsonrpc': '2.0', 'id': 7, 'method': 'rhino_run_script',
+        'params': {'script': 'print(1)', 'stream': True}
+    }, notify)
+    assert response['result']['data']['result'] == 2
+    assert notifications == [
+        ('rhino_run_script/partial', {'id': 7, 'chunk': 'line 0\n'}),
+        ('rhino_run_script/partial', {'id': 7, 'chunk': 'line 1\n'}),
+    ]
+
+
+def test_handle_batch_errors(server: RhinoMCPServer) -> None:
+    """Test handle_batch answers every call, including invalid ones."""
+    # Test an empty batch is a single error
+    response = asyncio.run(server.handle_batch([]))
+    assert isinstance(response, dict)
+    assert response['error']['code'] == -32600
+    
+    # Test each call in a batch gets its own response, in order
+    responses = asyncio.run(server.handle_batch([
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'rhino_ping'},
+        5,
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'nope'},
+    ]))
+    assert isinstance(responses, list)
+    assert responses[0]['result']['success'] is True
+    assert responses[1]['error']['code'] == -32600
+    assert responses[2]['error']['code'] == -32601
+
+
+def test_handle_websocket_envelope(server: RhinoMCPServer) -> None:
+    """Test handle_websocket answers each message of a batching envelope."""
+    websocket = FakeWebSocket([
+        json.dumps([BATCH_ENVELOPE, {'jsonrpc': '2.0', 'id': 1, 'method': 'rhino_ping'}, 'x', [
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'nope'}
+        ]]),
+        'not json',
+    ])
+    asyncio.run(server.handle_websocket(websocket))
+    
+    # Test the envelope's request, invalid item and JSON-RPC batch are answered
+    # separately, followed by the parse error
+    assert websocket.sent[0]['id'] == 1
+    assert websocket.sent[0]['result']['success'] is True
+    assert websocket.sent[1]['error']['code'] == -32600
+    assert websocket.sent[2][0]['error']['code'] == -32601
+    assert websocket.sent[3]['error']['code'] == -32700
+    assert len(websocket.sent) == 4
+
+
+def started(caplog: pytest.LogCaptureFixture) -> List[str]:
+    """Return the URLs logged as started by RhinoMCPServer.start."""
+    prefix = 'MCP server started at '
+    return [m[len(prefix):] for m in caplog.messages if m.startswith(prefix)]
+
+
+def test_start_listens_on_every_address(caplog: pytest.LogCaptureFixture) -> None:
+    """Test start binds each address the host resolves to and logs its real port."""
+    mcp = RhinoMCPServer(host='localhost', port=0)
+    addresses = {
+        info[4][0] for info in
+        socket.getaddrinfo('localhost', 0, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)
+    }
+    
+    async def run() -> List[str]:
+        task = asyncio.create_task(mcp.start())
+        while not task.done() and len(started(caplog)) < len(addresses):
+            await asyncio.sleep(0.01)
+        urls = started(caplog)
+        
+        # Test each logged address accepts connections
+        for url in urls:
+            host, port = url[len('ws://'):].rsplit(':', 1)
+            _, writer = await asyncio.open_connection(host.strip('[]'), int(port))
+            writer.close()
+        mcp.stop()
+        await task
+        return urls
+    
+    with caplog.at_level(logging.INFO, logger='rhino_mcp'):
+        urls = asyncio.run(run())
+    assert len(urls) == len(addresses)
+    assert not any(url.endswith(':0') for url in urls)
+
+
+def test_ensure_connected_on_each_event_loop(server: RhinoMCPServer) -> None:
+    """Test connection attempts can be made from more than one event loop."""
+    client = server.rhino_client
+    
+    async def connect_twice() -> None:
+        # Test concurrent callers share one connection attempt
+        await asyncio.gather(server._ensure_connected(), server._ensure_connected())
+    
+    for _ in range(2):
+        client.connected = False
+        asyncio.run(connect_twice())
+        assert client.connected is True
+
+
+@pytest.mark.parametrize('argv', [
+    [],
+    ['--host', '0.0.0.0', '--port=5001', '--debug'],
+    ['--rhino-host=10.0.0.2', '--rhino-port', '9999', '--reuse-port'],
+])
+def test_parse_args_matches_argparse(argv: List[str]) -> None:
+    """Test the fast command line parser agrees with argparse."""
+    assert parse_args(argv) == _parse_args_full(argv)
+
+
+def test_parse_args_missing_value() -> None:
+    """Test an option followed by another flag is not given the flag as its value."""
+    with pytest.raises(SystemExit):
+        parse_args(['--host', '--debug'])
+    with pytest.raises(SystemExit):
+        parse_args(['--port'])
@@ -4,11 +4,15 @@ import socket
 import threading
 import time
 import json
+import base64
+import struct
 import pytest
-from pytest.monkeypatch import MonkeyPatch
-from pytest.logging import LogCaptureFixture
+from pytest import MonkeyPatch, LogCaptureFixture
 
-from rhino_mcp.rhino_client import RhinoClient, Point3d
+from rhino_mcp.rhino_client import (
+    RhinoClient, Point3d, FRAME_HEADER, CHUNKED_FRAME, CHUNK_HEADER, CONTENT_JSON, CONTENT_MSGPACK,
+    MAX_FRAME_SIZE
+)
 
 
 class MockSocket:
@@ -17,29 +21,97 @@ class MockSocket:
     def __init__(self) -> None:
         """Initialize mock socket."""
         self.sent_data: List[bytes] = []
-        self.responses: List[bytes] = []
+        self.responses = bytearray()
+        self.options: Dict[Tuple[int, int], int] = {}
+        self.send_error: Optional[BaseException] = None
+        self.connects = 0
+        self.peer_closed = False
+    
+    def setsockopt(self, level: int, optname: int, value: int) -> None:
+        """Mock setsockopt method to record socket options."""
+        self.options[(level, optname)] = value
     
     def connect(self, addr: Tuple[str, int]) -> None:
         """Mock connect method."""
-        pass
+        self.connects += 1
+        self.peer_closed = False
     
     def sendall(self, data: bytes) -> None:
-        """Mock sendall method to record sent data."""
+        """Mock sendall method to record sent data, failing once if set."""
+        if self.send_error is not None:
+            error, self.send_error = self.send_error, None
+            raise error
         self.sent_data.append(data)
     
-    def recv(self, bufsize: int) -> bytes:
-        """Mock recv method to return pre-configured responses."""
-        if not self.responses:
-            return b""
-        return self.responses.pop(0)
+    def sendmsg(self, buffers: List[bytes]) -> int:
+        """Mock sendmsg method to record the gathered buffers as one send."""
+        data = b''.join(buffers)
+        self.sendall(data)
+        return len(data)
+    
+    def recv(self, bufsize: int, flags: int = 0) -> bytes:
+        """Mock recv method to return pre-configured response bytes."""
+        if flags & socket.MSG_PEEK:
+            # Peeks see an idle connection unless the peer closed it
+            if self.peer_closed:
+                return b''
+            if not self.responses:
+                raise BlockingIOError()
+            return bytes(self.responses[:bufsize])
+        data = bytes(self.responses[:bufsize])
+        del self.responses[:bufsize]
+        return data
+    
+    def setblocking(self, flag: bool) -> None:
+        """Mock setblocking method."""
+        pass
+    
+    def recv_into(self, buffer: memoryview) -> int:
+        """Mock recv_into method to fill a buffer from the response bytes."""
+        count = min(len(buffer), len(self.responses))
+        buffer[:count] = self.responses[:count]
+        del self.responses[:count]
+        return count
     
     def close(self) -> None:
         """Mock close method."""
         pass
     
     def add_response(self, response: Dict[str, Any]) -> None:
-        """Add a response to the mock socket."""
-        self.responses.append(json.dumps(response).encode('utf-8'))
+        """Add a framed response to the mock socket."""
+        payload = json.dumps(response).encode('utf-8')
+        self.responses += FRAME_HEADER.pack(len(payload), CONTENT_JSON) + payload
+    
+    def add_msgpack_response(self, response: Dict[Any, Any]) -> None:
+        """Add a framed MessagePack response to the mock socket."""
+        import msgpack
+        payload = msgpack.packb(response, use_bin_type=True)
+        self.responses += FRAME_HEADER.pack(len(payload), CONTENT_MSGPACK) + payload
+    
+    def add_chunked_response(self, response: Dict[str, Any], chunk_size: int) -> None:
+        """Add a response split into a chunked frame to the mock socket."""
+        payload = json.dumps(response).encode('utf-8')
+        self.responses += FRAME_HEADER.pack(CHUNKED_FRAME, CONTENT_JSON)
+        for i in range(0, len(payload), chunk_size):
+            chunk = payload[i:i + chunk_size]
+            self.responses += CHUNK_HEADER.pack(len(chunk)) + chunk
+        self.responses += CHUNK_HEADER.pack(0)
+    
+    def sent_command(self, index: int) -> Dict[str, Any]:
+        """Decode a framed command sent through the mock socket."""
+        data = self.sent_data[index]
+        size, content_type = FRAME_HEADER.unpack(data[:FRAME_HEADER.size])
+        assert size == len(data) - FRAME_HEADER.size
+        if content_type == CONTENT_MSGPACK:
+            import msgpack
+            return msgpack.unpackb(data[FRAME_HEADER.size:], raw=False)
+        assert content_type == CONTENT_JSON
+        return json.loads(data[FRAME_HEADER.size:].decode('utf-8'))
+
+
+def decode_blob(blob: Union[str, bytes]) -> bytes:
+    """Decode a points blob sent as raw bytes or base64 text."""
+    return blob if isinstance(blob, bytes) else base64.b64decode(blob)
 
 
 @pytest.fixture
@@ -63,6 +135,7 @@ def test_rhino_client_connect(mock_socket: MockSocket) -> None:
     # Test successful connection
     assert client.connect() is True
     assert client.connected is True
+    assert mock_socket.options[(socket.IPPROTO_TCP, socket.TCP_NODELAY)] == 1
 
 
 def test_rhino_client_ping(mock_socket: MockSocket) -> None:
@@ -88,7 +161,7 @@ def test_rhino_client_ping(mock_socket: MockSocket) -> None:
     
     # Verify request was sent
     assert len(mock_socket.sent_data) == 1
-    request = json.loads(mock_socket.sent_data[0].decode('utf-8'))
+    request = mock_socket.sent_command(0)
     assert request['type'] == 'ping'
     
     # Verify response was parsed correctly
@@ -125,7 +198,7 @@ def test_rhino_client_create_curve(mock_socket: MockSocket) -> None:
     
     # Verify request was sent
     assert len(mock_socket.sent_data) == 1
-    request = json.loads(mock_socket.sent_data[0].decode('utf-8'))
+    request = mock_socket.sent_command(0)
     assert request['type'] == 'create_curve'
     assert 'data' in request
     assert 'points' in request['data']
@@ -149,3 +222,220 @@ def test_rhino_client_invalid_points() -> None:
     # Test with single point
     with pytest.raises(ValueError):
         client.create_curve([{'x': 0.0, 'y': 0.0, 'z': 0.0}])
+    
+    # Test with a non-finite coordinate
+    with pytest.raises(ValueError):
+        client.create_curve([{'x': 0.0, 'y': 0.0, 'z': 0.0}, {'x': float('nan'), 'y': 0.0, 'z': 0.0}])
+
+
+def test_rhino_client_create_curve_binary(mock_socket: MockSocket) -> None:
+    """Test RhinoClient create_curve_binary method."""
+    client = RhinoClient()
+    client.connect()
+    
+    mock_socket.add_response({
+        'status': 'success',
+        'message': 'Curve created with 2 points',
+        'data': {
+            'id': '12345-67890',
+            'point_count': 2
+        }
+    })
+    
+    # Test create_curve_binary with a flat coordinate list
+    response = client.create_curve_binary([0.0, 0.0, 0.0, 5.0, 10.0, -1.5])
+    
+    # Verify the points were sent as a packed little-endian float64 blob
+    request = mock_socket.sent_command(0)
+    assert request['type'] == 'create_curve'
+    blob = decode_blob(request['data']['points_blob'])
+    assert struct.unpack('<6d', blob) == (0.0, 0.0, 0.0, 5.0, 10.0, -1.5)
+    assert response['status'] == 'success'
+    
+    # Test a buffer-protocol object is sent without conversion
+    mock_socket.add_response({'status': 'success', 'data': {'point_count': 2}})
+    client.create_curve_binary(memoryview(struct.pack('=6d', 1.0, 2.0, 3.0, 4.0, 5.0, 6.0)).cast('d'))
+    blob = decode_blob(mock_socket.sent_command(1)['data']['points_blob'])
+    assert struct.unpack('<6d', blob) == (1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+    
+    # Test with too few or partial points
+    with pytest.raises(ValueError):
+        client.create_curve_binary([0.0, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        client.create_curve_binary([0.0, 0.0, 0.0, 1.0])
+
+
+def test_rhino_client_create_curves(mock_socket: MockSocket) -> None:
+    """Test RhinoClient create_curves method."""
+    client = RhinoClient()
+    client.connect()
+    
+    mock_socket.add_response({
+        'status': 'success',
+        'message': '2 curves created',
+        'data': {'ids': ['a', 'b'], 'count': 2}
+    })
+    
+    # Test both curves are sent in one blob with their point counts
+    response = client.create_curves([
+        [{'x': 0.0, 'y': 0.0, 'z': 0.0}, {'x': 1.0, 'y': 1.0, 'z': 0.0}],
+        [{'x': 2.0, 'y': 0.0, 'z': 0.0}, {'x': 3.0, 'y': 1.0, 'z': 0.0}, {'x': 4.0, 'y': 0.0, 'z': 0.0}]
+    ])
+    
+    request = mock_socket.sent_command(0)
+    assert request['type'] == 'create_curves'
+    assert request['data']['counts'] == [2, 3]
+    blob = decode_blob(request['data']['points_blob'])
+    assert struct.unpack('<15d', blob)[6:9] == (2.0, 0.0, 0.0)
+    assert response['data']['count'] == 2
+    
+    # Test with no curves or a curve with a single point
+    with pytest.raises(ValueError):
+        client.create_curves([])
+    with pytest.raises(ValueError):
+        client.create_curves([[{'x': 0.0, 'y': 0.0, 'z': 0.0}]])
+
+
+def test_rhino_client_run_script_stream(mock_socket: MockSocket) -> None:
+    """Test RhinoClient run_script_stream method."""
+    client = RhinoClient()
+    client.connect()
+    
+    mock_socket.add_response({'status': 'partial', 'data': {'chunk': 'line 0\n'}})
+    mock_socket.add_response({'status': 'partial', 'data': {'chunk': 'line 1\n'}})
+    mock_socket.add_response({
+        'status': 'success',
+        'message': 'Script executed successfully',
+        'data': {'result': 2}
+    })
+    
+    # Test the output chunks are passed on before the final response
+    chunks: List[str] = []
+    response = client.run_script_stream('for i in range(2): print("line", i)', chunks.append)
+    
+    request = mock_socket.sent_command(0)
+    assert request['type'] == 'run_script'
+    assert request['data']['stream'] is True
+    assert chunks == ['line 0\n', 'line 1\n']
+    assert response['data']['result'] == 2
+
+
+def test_rhino_client_chunked_response(mock_socket: MockSocket) -> None:
+    """Test RhinoClient reassembles a response sent as a chunked frame."""
+    client = RhinoClient()
+    client.connect()
+    
+    mock_socket.add_chunked_response({
+        'status': 'success',
+        'message': 'Script executed successfully',
+        'data': {'result': list(range(100))}
+    }, chunk_size=16)
+    
+    response = client.run_script('result = list(range(100))')
+    assert response['data']['result'] == list(range(100))
+
+
+def test_rhino_client_context_manager(mock_socket: MockSocket) -> None:
+    """Test RhinoClient connects and disconnects as a context manager."""
+    with RhinoClient() as client:
+        assert client.connected is True
+    assert client.connected is False
+
+
+def test_rhino_client_reconnects_after_reset(mock_socket: MockSocket) -> None:
+    """Test RhinoClient retries a command once on a reset connection."""
+    client = RhinoClient()
+    client.connect()
+    
+    mock_socket.send_error = ConnectionResetError()
+    mock_socket.add_response({'status': 'success', 'message': 'Rhino is connected'})
+    
+    # Test the command is resent on a fresh connection
+    response = client.ping()
+    assert response['status'] == 'success'
+    assert mock_socket.connects == 2
+    assert mock_socket.sent_command(0)['type'] == 'ping'
+
+
+def test_rhino_client_reconnects_after_peer_close(mock_socket: MockSocket) -> None:
+    """Test RhinoClient reconnects when the bridge closed it between commands."""
+    client = RhinoClient()
+    client.connect()
+    mock_socket.add_response({'status': 'success', 'message': 'Rhino is connected'})
+    assert client.ping()['status'] == 'success'
+    
+    # Test the next command goes out on a fresh connection instead of failing
+    mock_socket.peer_closed = True
+    mock_socket.add_response({'status': 'success', 'message': 'Rhino is connected'})
+    assert client.ping()['status'] == 'success'
+    assert mock_socket.connects == 2
+    assert len(mock_socket.sent_data) == 2
+    assert client.connected is True
+
+
+def test_rhino_client_does_not_resend_after_close(mock_socket: MockSocket) -> None:
+    """Test RhinoClient does not resend a command the bridge may have run."""
+    client = RhinoClient()
+    client.connect()
+    
+    # Test the bridge closing before replying raises without a retry
+    with pytest.raises(RuntimeError):
+        client.run_script('result = 1')
+    assert mock_socket.connects == 1
+    assert len(mock_socket.sent_data) == 1
+
+
+def test_rhino_client_falls_back_to_json(mock_socket: MockSocket) -> None:
+    """Test RhinoClient resends as JSON when the bridge rejects MessagePack."""
+    pytest.importorskip('msgpack')
+    client = RhinoClient(use_msgpack=True)
+    client.connect()
+    
+    mock_socket.add_response({
+        'status': 'error',
+        'message': 'Unsupported content type: 2',
+        'code': 'unsupported_content_type'
+    })
+    mock_socket.add_response({'status': 'success', 'message': 'Rhino is connected'})
+    
+    # Test the command is resent as JSON, which is then kept for later commands
+    response = client.ping()
+    assert response['status'] == 'success'
+    assert mock_socket.sent_data[0][FRAME_HEADER.size - 1] == CONTENT_MSGPACK
+    assert mock_socket.sent_data[1][FRAME_HEADER.size - 1] == CONTENT_JSON
+    assert mock_socket.sent_command(1)['type'] == 'ping'
+    assert client.content_type == CONTENT_JSON
+
+
+def test_rhino_client_msgpack_non_string_keys(mock_socket: MockSocket) -> None:
+    """Test RhinoClient decodes MessagePack results with non-string keys."""
+    pytest.importorskip('msgpack')
+    client = RhinoClient(use_msgpack=True)
+    client.connect()
+    
+    mock_socket.add_msgpack_response({
+        'status': 'success',
+        'message': 'Script executed successfully',
+        'data': {'result': {1: 'a', 2: 'b'}}
+    })
+    
+    response = client.run_script('result = {1: "a", 2: "b"}')
+    assert mock_socket.sent_data[0][FRAME_HEADER.size - 1] == CONTENT_MSGPACK
+    assert response['data']['result'] == {1: 'a', 2: 'b'}
+
+
+def test_rhino_client_disconnects_after_bad_frame(mock_socket: MockSocket) -> None:
+    """Test RhinoClient drops a connection left mid-frame by a failed command."""
+    client = RhinoClient()
+    client.connect()
+    
+    # Test an oversized frame fails the command and marks the client disconnected
+    mock_socket.responses += FRAME_HEADER.pack(MAX_FRAME_SIZE + 1, CONTENT_JSON) + b'{"status": '
+    with pytest.raises(RuntimeError):
+        client.ping()
+    assert client.connected is False
+    
+    # Test the rest of the bad frame can't be read as the next reply
+    client.connect()
+    mock_socket.add_response({'status': 'success', 'message': 'Rhino is connected'})
+    assert client.ping()['status'] == 'success'
@@ -0,0 +1,202 @@
+"""Tests for the Rhino Bridge server's message framing."""
+from typing import Any, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import pytest
+from pytest import MonkeyPatch
+
+from rhino_plugin import rhino_server
+from rhino_plugin.rhino_server import (
+    read_frame, write_frame, write_chunk, write_message, decode_message,
+    FRAME_HEADER, CHUNKED_FRAME, CONTENT_JSON, CONTENT_MSGPACK, STREAM_CHUNK_SIZE
+)
+
+
+class MockWriter:
+    """Stream writer stand-in that collects written bytes."""
+    
+    def __init__(self) -> None:
+        """Initialize mock writer."""
+        self.data = bytearray()
+    
+    def write(self, data: bytes) -> None:
+        """Mock write method to record written bytes."""
+        self.data += data
+    
+    def writelines(self, buffers: List[bytes]) -> None:
+        """Mock writelines method to record the buffers in order."""
+        for data in buffers:
+            self.write(data)
+    
+    async def drain(self) -> None:
+        """Mock drain method."""
+        pass
+
+
+def read_frames(data: bytes) -> List[Optional[Tuple[int, bytes]]]:
+    """Read frames from data with read_frame until the stream ends."""
+    async def read_all() -> List[Optional[Tuple[int, bytes]]]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        frames: List[Optional[Tuple[int, bytes]]] = []
+        while True:
+            frame = await read_frame(reader)
+            frames.append(frame)
+            if frame is None:
+                return frames
+    return asyncio.run(read_all())
+
+
+def test_frame_round_trip() -> None:
+    """Test frames written by write_frame are read back by read_frame."""
+    writer = MockWriter()
+    write_frame(writer, b'{"type": "ping"}')
+    write_frame(writer, b'\x81\xa4type\xa4ping', CONTENT_MSGPACK)
+    write_frame(writer, b'')
+    
+    assert read_frames(bytes(writer.data)) == [
+        (CONTENT_JSON, b'{"type": "ping"}'),
+        (CONTENT_MSGPACK, b'\x81\xa4type\xa4ping'),
+        (CONTENT_JSON, b''),
+        None
+    ]
+
+
+def test_chunked_frame_round_trip() -> None:
+    """Test a chunked frame written with write_chunk is reassembled."""
+    writer = MockWriter()
+    writer.write(FRAME_HEADER.pack(CHUNKED_FRAME, CONTENT_JSON))
+    write_chunk(writer, b'{"status": ')
+    write_chunk(writer, b'"success"}')
+    write_chunk(writer, b'')
+    write_frame(writer, b'{}')
+    
+    assert read_frames(bytes(writer.data)) == [
+        (CONTENT_JSON, b'{"status": "success"}'),
+        (CONTENT_JSON, b'{}'),
+        None
+    ]
+
+
+def test_read_frame_errors() -> None:
+    """Test read_frame rejects truncated and oversized frames."""
+    # Test a connection closed mid-header or mid-payload
+    with pytest.raises(ConnectionError):
+        read_frames(FRAME_HEADER.pack(10, CONTENT_JSON)[:3])
+    with pytest.raises(ConnectionError):
+        read_frames(FRAME_HEADER.pack(10, CONTENT_JSON) + b'{}')
+    
+    # Test a frame over MAX_FRAME_SIZE
+    with pytest.raises(ValueError):
+        read_frames(FRAME_HEADER.pack(rhino_server.MAX_FRAME_SIZE + 1, CONTENT_JSON))
+
+
+def test_write_message_chunked(monkeypatch: MonkeyPatch) -> None:
+    """Test a large message encoded without orjson is sent as a chunked frame."""
+    monkeypatch.setattr(rhino_server, 'orjson', None)
+    message = {'status': 'success', 'data': {'result': list(range(STREAM_CHUNK_SIZE // 2))}}
+    writer = MockWriter()
+    asyncio.run(write_message(writer, message))
+    
+    assert FRAME_HEADER.unpack(writer.data[:FRAME_HEADER.size]) == (CHUNKED_FRAME, CONTENT_JSON)
+    frames = read_frames(bytes(writer.data))
+    assert decode_message(frames[0][1]) == message
+    assert frames[1] is None
+
+
+def test_write_message_encode_error(monkeypatch: MonkeyPatch) -> None:
+    """Test a message that fails to encode never leaves a frame half-written."""
+    monkeypatch.setattr(rhino_server, 'orjson', None)
+    
+    # Test a small message is answered with an error frame instead
+    circular: List[Any] = []
+    circular.append(circular)
+    writer = MockWriter()
+    asyncio.run(write_message(writer, {'status': 'success', 'data': circular}))
+    frames = read_frames(bytes(writer.data))
+    assert decode_message(frames[0][1])['status'] == 'error'
+    
+    # Test a failure after the chunked frame started drops the connection
+    large: List[Any] = list(range(STREAM_CHUNK_SIZE))
+    large.append(large)
+    writer = MockWriter()
+    with pytest.raises(ConnectionError):
+        asyncio.run(write_message(writer, {'status': 'success', 'data': large}))
+
+
+def test_decode_msgpack_non_string_keys() -> None:
+    """Test MessagePack commands may carry maps with non-string keys."""
+    msgpack = pytest.importorskip('msgpack')
+    data = msgpack.packb({'type': 'run_script', 'data': {1: 'a'}}, use_bin_type=True)
+    assert decode_message(data, CONTENT_MSGPACK) == {'type': 'run_script', 'data': {1: 'a'}}
+
+
+def test_error_result_verbose() -> None:
+    """Test error_result adds a traceback only when verbose errors were asked for."""
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        assert 'traceback' in rhino_server.error_result("bad input", {'verbose': True})
+        assert rhino_server.error_result("bad input", {}) == {'status': 'error', 'message': "bad input"}
+        # Test command data that is not an object
+        assert rhino_server.error_result("bad input", ['verbose']) == {
+            'status': 'error', 'message': "bad input"
+        }
+
+
+def test_process_command_unknown_type() -> None:
+    """Test a command type that is unknown or not a string is answered as unknown."""
+    for cmd_type in ('nope', ['ping'], {'type': 'ping'}, None):
+        result = rhino_server.process_command(cmd_type, {}, lambda payload: None)
+        assert result == {'status': 'error', 'message': 'Unknown command'}
+
+
+def test_compile_script_cache(monkeypatch: MonkeyPatch) -> None:
+    """Test compiled scripts are reused and the least recently used is evicted."""
+    monkeypatch.setattr(rhino_server, 'SCRIPT_CACHE_SIZE', 2)
+    monkeypatch.setattr(rhino_server, '_script_cache', OrderedDict())
+    compile_script = rhino_server.compile_script
+    
+    first = compile_script('a = 1')
+    second = compile_script('b = 2')
+    assert compile_script('a = 1') is first
+    
+    # Test adding a third script evicts 'b = 2', used least recently
+    compile_script('c = 3')
+    assert compile_script('a = 1') is first
+    assert compile_script('b = 2') is not second
+
+
+class NetList:
+    """Stand-in for a .NET collection, which has Count and Item."""
+    
+    def __init__(self, items: List[Any]) -> None:
+        """Initialize the collection."""
+        self.items = items
+        self.Count = len(items)
+        self.Item = items.__getitem__
+    
+    def __iter__(self) -> Any:
+        return iter(self.items)
+
+
+class NetVersion:
+    """Stand-in for a .NET object that is sent as its string form."""
+    
+    def __str__(self) -> str:
+        return '8.0.0'
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_encode_default_converters(use_orjson: bool, monkeypatch: MonkeyPatch) -> None:
+    """Test encode_default converts collections and objects, caching each type's converter."""
+    if not use_orjson:
+        monkeypatch.setattr(rhino_server, 'orjson', None)
+    monkeypatch.setattr(rhino_server, '_CONVERTERS', {})
+    message = {'data': {'list': NetList([1, NetVersion()]), 'version': NetVersion()}}
+    
+    assert decode_message(rhino_server.encode_message(message)) == {
+        'data': {'list': [1, '8.0.0'], 'version': '8.0.0'}
+    }
+    assert rhino_server._CONVERTERS == {NetList: rhino_server._collection_to_list, NetVersion: str}
@@ -0,0 +1,285 @@
+"""Tests for the stdio adapter scripts (ws_adapter.py and claude_adapter.py)."""
+from typing import Any, Generator, List, Optional
+from pathlib import Path
+import asyncio
+import importlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import pytest
+from pytest import MonkeyPatch
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_adapter(
+    args: List[str], stdin: Any, cwd: Path, input: Optional[bytes] = None
+) -> subprocess.CompletedProcess:
+    """Run an adapter script in a subprocess, with the repo on its path."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(ROOT / 'src'), str(ROOT)])
+    return subprocess.run(
+        [sys.executable, *args], stdin=stdin, input=input, cwd=cwd, env=env,
+        capture_output=True, timeout=20
+    )
+
+
+@pytest.fixture
+def ws_adapter(tmp_path: Path, monkeypatch: MonkeyPatch) -> Any:
+    """Import ws_adapter.py, keeping its log file out of the repo."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(ROOT))
+    return importlib.import_module('ws_adapter')
+
+
+@pytest.fixture
+def refused_port() -> Generator[None, None, None]:
+    """Hold the RhinoMCP server port closed, so connections are refused."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind(('127.0.0.1', 5000))
+    except OSError:
+        sock.close()
+        pytest.skip("port 5000 is in use")
+    yield
+    sock.close()
+
+
+@pytest.mark.parametrize('stdin', ['devnull', 'file', 'pipe'])
+def test_ws_adapter_exits_at_stdin_eof_while_disconnected(
+    stdin: str, tmp_path: Path, refused_port: None
+) -> None:
+    """Test ws_adapter stops reconnecting once stdin ends."""
+    message = b'{"jsonrpc": "2.0", "id": 1, "method": "rhino_ping"}\n'
+    if stdin == 'pipe':
+        result = run_adapter([str(ROOT / 'ws_adapter.py')], None, tmp_path, input=message)
+    elif stdin == 'file':
+        path = tmp_path / 'requests.txt'
+        path.write_bytes(message)
+        with open(path, 'rb') as f:
+            result = run_adapter([str(ROOT / 'ws_adapter.py')], f, tmp_path)
+    else:
+        result = run_adapter([str(ROOT / 'ws_adapter.py')], subprocess.DEVNULL, tmp_path)
+    
+    # Test the adapter neither aborts on a non-pipe stdin nor retries forever
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == b''
+
+
+@pytest.mark.parametrize('stdin', ['devnull', 'file'])
+def test_claude_adapter_stdin_reader_without_pipe(stdin: str, tmp_path: Path) -> None:
+    """Test claude_adapter falls back to thread reads for a non-pipe stdin."""
+    code = (
+        "import claude_adapter\n"
+        "from rhino_mcp.event_loop import run_event_loop\n"
+        "print(run_event_loop(claude_adapter.open_stdin_reader()))\n"
+    )
+    if stdin == 'file':
+        path = tmp_path / 'requests.txt'
+        path.write_bytes(b'{}\n')
+        with open(path, 'rb') as f:
+            result = run_adapter(['-c', code], f, tmp_path)
+    else:
+        result = run_adapter(['-c', code], subprocess.DEVNULL, tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == b'None'
+
+
+def test_ws_adapter_read_ahead(ws_adapter: Any) -> None:
+    """Test messages read ahead while disconnected are kept for read()."""
+    async def run() -> Any:
+        stream = asyncio.StreamReader()
+        stream.feed_data(b'{"id": 1}\n{"id": 2}\n')
+        stream.feed_eof()
+        reader = ws_adapter.MessageReader(stream)
+        await reader.read_ahead(1.0)
+        return reader.eof, [await reader.read(), await reader.read()]
+    
+    eof, messages = asyncio.run(run())
+    assert eof is True
+    assert messages == ['{"id": 1}', '{"id": 2}']
+
+
+def test_ws_adapter_aborts_cut_off_message(ws_adapter: Any) -> None:
+    """Test a streamed message cut off by a disconnect can't corrupt the next one."""
+    async def run() -> bytes:
+        stream = io.BytesIO()
+        stdout = ws_adapter.StdoutBuffer(stream, asyncio.get_running_loop())
+        
+        # Test an unflushed partial message is dropped
+        stdout.write_fragment(b'{"a": ')
+        stdout.abort_message()
+        stdout.flush()
+        assert stream.getvalue() == b''
+        
+        # Test a partly flushed message is ended on its own line
+        stdout.write_fragment(b'{"a": ')
+        stdout.flush()
+        stdout.write_fragment(b'[1, ')
+        stdout.abort_message()
+        stdout.write(b'{"b": 2}')
+        stdout.flush()
+        return stream.getvalue()
+    
+    assert asyncio.run(run()) == b'{"a": \n{"b": 2}\n'
+
+
+@pytest.mark.parametrize('source', ['pipe', 'thread'])
+def test_ws_adapter_skips_bad_stdin_lines(
+    source: str, ws_adapter: Any, monkeypatch: MonkeyPatch
+) -> None:
+    """Test a line that isn't UTF-8 or is too long is skipped whole."""
+    monkeypatch.setattr(ws_adapter, 'STDIN_MESSAGE_LIMIT', 16)
+    monkeypatch.setattr(ws_adapter, 'STDIN_SKIP_CHUNK', 8)
+    data = b'\xff\n' + b'x' * 40 + b'\n{"id": 1}\n'
+    
+    async def run() -> List[Any]:
+        if source == 'pipe':
+            stream: Any = asyncio.StreamReader(limit=16)
+            stream.feed_data(data)
+            stream.feed_eof()
+        else:
+            stream = ws_adapter.ExecutorStdinReader(io.BytesIO(data))
+        reader = ws_adapter.MessageReader(stream)
+        return [await reader.read(), await reader.read()]
+    
+    assert asyncio.run(run()) == ['{"id": 1}', None]
+
+
+def test_ws_adapter_skips_oversized_length_frame(ws_adapter: Any, monkeypatch: MonkeyPatch) -> None:
+    """Test an oversized length-framed message is skipped without losing sync."""
+    monkeypatch.setattr(ws_adapter, 'LENGTH_FRAMING', True)
+    monkeypatch.setattr(ws_adapter, 'STDIN_MESSAGE_LIMIT', 16)
+    monkeypatch.setattr(ws_adapter, 'STDIN_SKIP_CHUNK', 8)
+    header = ws_adapter.LENGTH_HEADER
+    
+    async def run() -> List[Any]:
+        stream = asyncio.StreamReader()
+        stream.feed_data(header.pack(40) + b'x' * 40 + header.pack(9) + b'{"id": 1}')
+        stream.feed_data(header.pack(10) + b'{"id"')
+        stream.feed_eof()
+        reader = ws_adapter.MessageReader(stream)
+        return [await reader.read(), await reader.read()]
+    
+    # Test a message cut off by the end of stdin ends the stream
+    assert asyncio.run(run()) == [b'{"id": 1}', None]
+
+
+def test_ws_adapter_parse_cpu_list(ws_adapter: Any) -> None:
+    """Test Linux CPU lists are parsed into sets of CPU numbers."""
+    assert ws_adapter.parse_cpu_list('2') == {2}
+    assert ws_adapter.parse_cpu_list('0-1,4\n') == {0, 1, 4}
+    with pytest.raises(ValueError):
+        ws_adapter.parse_cpu_list('0-x')
+
+
+def test_ws_adapter_l3_siblings(ws_adapter: Any, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Test the L3 cache is found by its level, whichever index it is."""
+    monkeypatch.setattr(ws_adapter, 'CPU_SYSFS', str(tmp_path))
+    for cpu, levels in ((0, ['1', '1', '3']), (1, ['1', '2'])):
+        for index, level in enumerate(levels):
+            cache = tmp_path / f'cpu{cpu}' / 'cache' / f'index{index}'
+            cache.mkdir(parents=True)
+            (cache / 'level').write_text(level + '\n')
+            (cache / 'shared_cpu_list').write_text(f'{index}-7\n')
+    
+    assert ws_adapter.l3_siblings(0) == set(range(2, 8))
+    # Test a CPU without an L3 cache gives None
+    assert ws_adapter.l3_siblings(1) is None
+
+
+def test_ws_adapter_stdout_flush_thresholds(ws_adapter: Any, monkeypatch: MonkeyPatch) -> None:
+    """Test stdout is flushed by message count, by size, or after the delay."""
+    monkeypatch.setattr(ws_adapter, 'STDOUT_FLUSH_MESSAGES', 3)
+    monkeypatch.setattr(ws_adapter, 'STDOUT_FLUSH_BYTES', 16)
+    
+    async def run() -> None:
+        stream = io.BytesIO()
+        stdout = ws_adapter.StdoutBuffer(stream, asyncio.get_running_loop())
+        
+        # Test the third message triggers a flush
+        stdout.write('{}')
+        stdout.write('{}')
+        assert stream.getvalue() == b''
+        stdout.write('{}')
+        assert stream.getvalue() == b'{}\n{}\n{}\n'
+        
+        # Test a message over the byte threshold is flushed at once (its
+        # newline follows with the next flush)
+        stdout.write('{"a": "0123456789"}')
+        assert stream.getvalue().endswith(b'{"a": "0123456789"}')
+        
+        # Test a lone small message is flushed after the delay
+        stdout.write('{"b": 1}')
+        assert not stream.getvalue().endswith(b'{"b": 1}\n')
+        await asyncio.sleep(ws_adapter.STDOUT_FLUSH_DELAY * 10)
+        assert stream.getvalue().endswith(b'{"b": 1}\n')
+    
+    asyncio.run(run())
+
+
+def test_ws_adapter_length_framing(ws_adapter: Any, monkeypatch: MonkeyPatch) -> None:
+    """Test length-framed messages written to stdout read back unchanged."""
+    monkeypatch.setattr(ws_adapter, 'LENGTH_FRAMING', True)
+    messages = ['{"id": 1}', b'{"id": 2,\n "x": 3}', '']
+    
+    async def run() -> List[Any]:
+        out = io.BytesIO()
+        stdout = ws_adapter.StdoutBuffer(out, asyncio.get_running_loop())
+        for message in messages:
+            stdout.write(message)
+        stdout.flush()
+        
+        stream = asyncio.StreamReader()
+        stream.feed_data(out.getvalue())
+        stream.feed_eof()
+        reader = ws_adapter.MessageReader(stream)
+        return [await reader.read() for _ in range(len(messages) + 1)]
+    
+    # Test a newline inside a message doesn't split it
+    assert asyncio.run(run()) == [b'{"id": 1}', b'{"id": 2,\n "x": 3}', b'', None]
+
+
+def test_ws_adapter_corked(ws_adapter: Any) -> None:
+    """Test corked() holds back partial segments only inside the block."""
+    if ws_adapter.TCP_CORK is None:
+        pytest.skip("TCP_CORK/TCP_NOPUSH is not available")
+    option = (socket.IPPROTO_TCP, ws_adapter.TCP_CORK)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        with ws_adapter.corked(sock):
+            assert sock.getsockopt(*option)
+        assert not sock.getsockopt(*option)
+        
+        # Test the socket is uncorked when the block raises
+        with pytest.raises(RuntimeError):
+            with ws_adapter.corked(sock):
+                raise RuntimeError("send failed")
+        assert not sock.getsockopt(*option)
+    
+    # Test no socket means nothing to cork
+    with ws_adapter.corked(None):
+        pass
+
+
+def test_ws_adapter_make_envelope(ws_adapter: Any) -> None:
+    """Test batching envelopes are built from text and from raw bytes messages."""
+    messages = ['{"id": 1}', '{"id": 2}']
+    assert ws_adapter.make_envelope(messages) == '["BATCH",{"id": 1},{"id": 2}]'
+    
+    # Test MCP_RAW=1 messages, which arrive as bytes or memoryviews
+    raw = [memoryview(b'{"id": 1}\n')[:-1], b'{"id": 2}']
+    envelope = ws_adapter.make_envelope(raw)
+    assert envelope == b'["BATCH",{"id": 1},{"id": 2}]'
+    assert json.loads(envelope) == ['BATCH', {'id': 1}, {'id': 2}]
+
+
+def test_ws_adapter_env_int(ws_adapter: Any, monkeypatch: MonkeyPatch) -> None:
+    """Test integer settings fall back to their default when unset or invalid."""
+    monkeypatch.delenv('WS_ADAPTER_TEST_INT', raising=False)
+    assert ws_adapter.env_int('WS_ADAPTER_TEST_INT', 7) == 7
+    for value, expected in (('4096', 4096), ('', 7), ('64k', 7), ('1.5', 7)):
+        monkeypatch.setenv('WS_ADAPTER_TEST_INT', value)
+        assert ws_adapter.env_int('WS_ADAPTER_TEST_INT', 7) == expected
@@ -6,95 +6,609 @@ This script forwards messages between Windsurf and the RhinoMCP server,
 acting as an adapter layer that handles the WebSocket connection.
 """
 import asyncio
+import atexit
+import collections
+import contextlib
 import json
+import os
+import socket
+import struct
 import sys
 import websockets
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from typing import Dict, Any, Optional, List
 import logging
+import logging.handlers
+import queue
 from websockets.exceptions import ConnectionClosed
+from rhino_mcp.event_loop import run_event_loop, is_pollable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("ws_adapter.log"),
-        logging.StreamHandler(sys.stderr)
-    ]
+# Configure logging. Records are queued and written by a listener thread,
+# so file and stderr writes never block the event loop. When stderr is piped
+# (as MCP clients do), only warnings and errors go to it; the log file still
+# gets everything.
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler("ws_adapter.log")
+file_handler.setFormatter(log_formatter)
+stderr_handler = logging.StreamHandler(sys.stderr)
+stderr_handler.setFormatter(log_formatter)
+if not sys.stderr.isatty():
+    stderr_handler.setLevel(logging.WARNING)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, stderr_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+logging.root.setLevel(logging.INFO)
 logger = logging.getLogger("ws-adapter")
 
+def env_int(name, default):
+    """Read an integer setting from the environment; unset or invalid values give the default."""
+    value = os.environ.get(name, "")
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not an integer; using %d", name, value, default)
+        return default
+
 # Target RhinoMCP server URL
 TARGET_URL = "ws://127.0.0.1:5000"
 
-async def forward_messages():
-    """Forward messages between stdin/stdout and the WebSocket server."""
+# Longest stdin message the adapter accepts; longer ones are skipped in
+# pieces of STDIN_SKIP_CHUNK bytes
+STDIN_MESSAGE_LIMIT = 8 * 1024 * 1024
+STDIN_SKIP_CHUNK = 64 * 1024
+
+# permessage-deflate costs more CPU than it saves on small JSON-RPC messages,
+# so it is off unless WS_ADAPTER_COMPRESSION=auto
+COMPRESSION = "deflate" if os.environ.get("WS_ADAPTER_COMPRESSION") == "auto" else None
+
+# Dropped connections are retried after RECONNECT_BACKOFF seconds, doubling
+# up to RECONNECT_BACKOFF_MAX, until stdin ends (it is watched between
+# attempts too). Keepalive pings are off: MCP sessions idle for minutes and
+# a dead connection shows up on the next send.
+RECONNECT_BACKOFF = 0.1
+RECONNECT_BACKOFF_MAX = 5.0
+OPEN_TIMEOUT = 2.0
+CLOSE_TIMEOUT = 1.0
+
+# Largest WebSocket message accepted from the server, and the send buffer
+# size above which sends wait for the buffer to drain
+WS_MAX_SIZE = STDIN_MESSAGE_LIMIT
+WS_WRITE_LIMIT = 1024 * 1024
+
+# Stdin/stdout carry newline-delimited JSON messages by default. With
+# WS_ADAPTER_FRAMING=length, each message is instead a 4-byte big-endian
+# length followed by that many bytes of JSON, and is forwarded as a binary
+# WebSocket message.
+LENGTH_FRAMING = os.environ.get("WS_ADAPTER_FRAMING") == "length"
+LENGTH_HEADER = struct.Struct(">I")
+
+# With MCP_RAW=1 messages are passed through as bytes in both directions,
+# never decoded to or encoded from str; stdin lines then go out as binary
+# WebSocket messages, which the RhinoMCP server accepts
+RAW_PASSTHROUGH = os.environ.get("MCP_RAW") == "1"
+
+# With WS_ADAPTER_BATCH=1, stdin lines arriving within BATCH_WINDOW seconds
+# of each other are sent as one ["BATCH", message, ...] WebSocket message
+# (up to BATCH_MAX_MESSAGES). The server must unpack the envelope, which
+# the RhinoMCP server does. With WS_ADAPTER_BATCH=cork, the lines are sent
+# as separate messages but in as few TCP segments as possible, which works
+# with any server.
+BATCH_MODE = os.environ.get("WS_ADAPTER_BATCH", "")
+BATCH_ENABLED = BATCH_MODE in ("1", "cork")
+BATCH_ENVELOPE = BATCH_MODE == "1"
+BATCH_WINDOW = 0.001
+BATCH_MAX_MESSAGES = 64
+
+# Messages for stdout are buffered until STDOUT_FLUSH_MESSAGES messages or
+# STDOUT_FLUSH_BYTES bytes (WS_ADAPTER_IO_BATCH_BYTES, if set) are waiting,
+# or STDOUT_FLUSH_DELAY seconds have passed since the first one
+STDOUT_FLUSH_MESSAGES = 32
+STDOUT_FLUSH_BYTES = env_int("WS_ADAPTER_IO_BATCH_BYTES", 64 * 1024)
+STDOUT_FLUSH_DELAY = 0.001
+
+# Socket option that holds back partial TCP segments: TCP_CORK on Linux,
+# TCP_NOPUSH on BSD and macOS
+TCP_CORK = getattr(socket, "TCP_CORK", None) or getattr(socket, "TCP_NOPUSH", None)
+
+# WS_ADAPTER_CPU_AFFINITY pins the adapter to a list of CPUs ("2" or
+# "0-1,4"), or with "auto" to the CPUs sharing an L3 cache with the one it
+# started on. Linux only; ignored elsewhere.
+CPU_AFFINITY = os.environ.get("WS_ADAPTER_CPU_AFFINITY", "")
+CPU_SYSFS = "/sys/devices/system/cpu"
+
+# Kernel send buffer for the WebSocket socket, so a large message is handed
+# over in few send() calls; matches the MCP server's SOCKET_BUFFER_SIZE
+SOCKET_SEND_BUFFER = 1 << 20
+
+class ExecutorStdinReader:
+    """Read stdin on a worker thread, for stdin that can't be awaited directly."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        # One dedicated thread: reads are sequential, and stay off the
+        # loop's default executor
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stdin")
+    
+    async def readuntil(self, separator=b"\n"):
+        """Read a line; raises ValueError, after skipping the rest of it, if it exceeds STDIN_MESSAGE_LIMIT."""
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(self.executor, self._readline)
+        if not line.endswith(separator):
+            raise asyncio.IncompleteReadError(line, None)
+        return line
+    
+    def _readline(self):
+        line = self.stream.readline(STDIN_MESSAGE_LIMIT + 1)
+        if len(line) > STDIN_MESSAGE_LIMIT and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = self.stream.readline(STDIN_SKIP_CHUNK)
+            raise ValueError(f"Message exceeds {STDIN_MESSAGE_LIMIT} bytes")
+        return line
+    
+    async def readexactly(self, n):
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self.executor, self.stream.read, n)
+        if len(data) < n:
+            raise asyncio.IncompleteReadError(data, n)
+        return data
+
+class MessageReader:
+    """Read framed messages from a stdin reader.
+    
+    A read in progress is kept if the caller is cancelled (e.g. by a batch
+    window timeout) and picked up by the next read(), so no message is lost.
+    Messages read ahead while disconnected are returned first.
+    """
+    
+    def __init__(self, reader):
+        self.reader = reader
+        self.eof = False
+        self._pending = None
+        self.backlog = collections.deque()
+    
+    async def read(self):
+        """Return the next message, or None at the end of stdin."""
+        if self.backlog:
+            return self.backlog.popleft()
+        return await self._next()
+    
+    async def read_ahead(self, timeout):
+        """Keep messages arriving within timeout seconds for later read() calls.
+        
+        Used while disconnected, so the end of stdin is noticed and the
+        adapter can exit instead of reconnecting forever.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.eof:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(self._next(), remaining)
+            except asyncio.TimeoutError:
+                break
+            except Exception as e:
+                logger.error("Error reading stdin: %s", e)
+                await asyncio.sleep(remaining)
+                break
+            if message is not None:
+                self.backlog.append(message)
+    
+    async def _next(self):
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._read())
+        pending = self._pending
+        try:
+            message = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # Keep the read, even if it completed just as we were cancelled
+            if pending.cancelled():
+                self._pending = None
+            raise
+        except Exception:
+            self._pending = None
+            raise
+        self._pending = None
+        if message is None:
+            self.eof = True
+        return message
+    
+    async def _read(self):
+        while True:
+            try:
+                return await self._read_message()
+            except ValueError as e:
+                # The bad message was skipped whole, so carry on with the next
+                logger.error("Skipping stdin message: %s", e)
+    
+    async def _read_message(self):
+        if not LENGTH_FRAMING:
+            try:
+                line = await self.reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                # Last line, without a trailing newline
+                if not e.partial:
+                    return None
+                line = e.partial
+            except asyncio.LimitOverrunError:
+                await skip_line(self.reader)
+                raise ValueError(f"Message exceeds {STDIN_MESSAGE_LIMIT} bytes")
+            # Only the newline needs removing; other whitespace (a "\r" from
+            # CRLF input, say) is valid around JSON
+            if RAW_PASSTHROUGH:
+                return memoryview(line)[:-1] if line.endswith(b"\n") else line
+            if line.endswith(b"\n"):
+                line = line[:-1]
+            return line.decode("utf-8")
+        
+        header = None
+        try:
+            header = await self.reader.readexactly(LENGTH_HEADER.size)
+            (size,) = LENGTH_HEADER.unpack(header)
+            if size > STDIN_MESSAGE_LIMIT:
+                # Read past the body, so the next header is found where expected
+                remaining = size
+                while remaining:
+                    remaining -= len(await self.reader.readexactly(min(remaining, STDIN_SKIP_CHUNK)))
+                raise ValueError(f"Message too large: {size} bytes")
+            return await self.reader.readexactly(size)
+        except asyncio.IncompleteReadError as e:
+            if e.partial or header is not None:
+                logger.warning("Stdin ended in the middle of a message")
+            return None
+
+async def skip_line(reader):
+    """Discard stdin up to and including the next newline."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            # e.consumed bytes can be dropped without passing a newline
+            await reader.readexactly(e.consumed)
+
+async def open_stdin_reader():
+    """Return a reader with async readuntil() and readexactly() over stdin's bytes.
+    
+    On POSIX a pipe, socket or terminal on stdin is read straight from the
+    event loop; on Windows, or for anything else (e.g. a redirected file),
+    reads fall back to a worker thread.
+    """
+    if sys.platform != "win32" and is_pollable(sys.stdin):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_MESSAGE_LIMIT)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+            return reader
+        except (ValueError, OSError):
+            pass
+    return ExecutorStdinReader(sys.stdin.buffer)
+
+class StdoutBuffer:
+    """Message writer that flushes stdout in batches."""
+    
+    def __init__(self, stream, loop):
+        self.stream = stream
+        self.loop = loop
+        self._buffer = bytearray()
+        self._count = 0
+        self._timer = None
+        # Where the message being written with write_fragment() starts in
+        # _buffer (None if there is none), and whether part of it has
+        # already been flushed
+        self._message_start = None
+        self._message_flushed = False
+    
+    def write(self, message):
+        if isinstance(message, str):
+            message = message.encode("utf-8")
+        if LENGTH_FRAMING:
+            self._buffer += LENGTH_HEADER.pack(len(message))
+            self._buffer += message
+            self._count += 1
+            self._schedule_flush()
+        else:
+            self.write_fragment(message)
+            self.end_message()
+    
+    def write_fragment(self, fragment):
+        """Buffer part of a newline-delimited message."""
+        if self._message_start is None:
+            self._message_start = len(self._buffer)
+        self._buffer += fragment
+        self._schedule_flush()
+    
+    def end_message(self):
+        """End a newline-delimited message written with write_fragment()."""
+        self._buffer += b"\n"
+        self._count += 1
+        self._message_start = None
+        self._message_flushed = False
+        self._schedule_flush()
+    
+    def abort_message(self):
+        """Drop a message written with write_fragment() that will not be ended.
+        
+        Parts of it already on stdout can't be taken back; they are ended
+        with a newline so the next message starts on a line of its own.
+        """
+        if self._message_start is None:
+            return
+        del self._buffer[self._message_start:]
+        if self._message_flushed:
+            self._buffer += b"\n"
+        self._message_start = None
+        self._message_flushed = False
+    
+    def _schedule_flush(self):
+        if self._count >= STDOUT_FLUSH_MESSAGES or len(self._buffer) >= STDOUT_FLUSH_BYTES:
+            self.flush()
+        elif self._timer is None:
+            self._timer = self.loop.call_later(STDOUT_FLUSH_DELAY, self.flush)
+    
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self.stream.write(self._buffer)
+            self.stream.flush()
+            if self._message_start is not None:
+                self._message_flushed |= len(self._buffer) > self._message_start
+                self._message_start = 0
+            self._buffer.clear()
+            self._count = 0
+
+def tune_socket(websocket):
+    """Tune the WebSocket's TCP socket for forwarding and return the socket.
+    
+    Disables Nagle's algorithm and enlarges the send buffer.
+    """
+    sock = websocket.transport.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SEND_BUFFER)
+    return sock
+
+@contextlib.contextmanager
+def corked(sock):
+    """Coalesce the frames written inside the block into full TCP segments."""
+    if sock is None or TCP_CORK is None:
+        yield
+        return
+    sock.setsockopt(socket.IPPROTO_TCP, TCP_CORK, 1)
     try:
-        logger.info(f"Connecting to RhinoMCP server at {TARGET_URL}")
-        async with websockets.connect(TARGET_URL) as websocket:
-            logger.info("Connected to RhinoMCP server")
-            
-            # Start tasks for handling stdin->websocket and websocket->stdout
-            stdin_task = asyncio.create_task(forward_stdin_to_websocket(websocket))
-            ws_task = asyncio.create_task(forward_websocket_to_stdout(websocket))
-            
-            # Wait for either task to complete (or fail)
-            done, pending = await asyncio.wait(
-                [stdin_task, ws_task],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Cancel any pending tasks
-            for task in pending:
-                task.cancel()
+        yield
+    finally:
+        # Uncorking pushes out whatever is still held back
+        sock.setsockopt(socket.IPPROTO_TCP, TCP_CORK, 0)
+
+async def run_until_first_done(*coros):
+    """Run coroutines as tasks until one finishes, then cancel and await the rest.
+    
+    The remaining tasks are awaited after cancelling, so none outlives this
+    call, and errors from every task are logged.
+    """
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Task error: %s", result)
+
+async def resolve_target():
+    """Resolve TARGET_URL's host and port once, so reconnects skip the lookup."""
+    url = urlsplit(TARGET_URL)
+    port = url.port or (443 if url.scheme == "wss" else 80)
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(url.hostname, port, type=socket.SOCK_STREAM)
+    return infos[0][4][:2]
+
+async def forward_messages():
+    """Forward messages between stdin/stdout and the WebSocket server.
+    
+    The connection is re-established with exponential backoff whenever it
+    fails or drops, until stdin ends.
+    """
+    reader = MessageReader(await open_stdin_reader())
+    address = None
+    backoff = RECONNECT_BACKOFF
+    while not reader.eof:
+        try:
+            if address is None:
+                address = await resolve_target()
+            logger.info("Connecting to RhinoMCP server at %s", TARGET_URL)
+            async with websockets.connect(
+                TARGET_URL,
+                host=address[0],
+                port=address[1],
+                compression=COMPRESSION,
+                max_size=WS_MAX_SIZE,
+                write_limit=WS_WRITE_LIMIT,
+                ping_interval=None,
+                ping_timeout=None,
+                open_timeout=OPEN_TIMEOUT,
+                close_timeout=CLOSE_TIMEOUT
+            ) as websocket:
+                logger.info("Connected to RhinoMCP server")
+                backoff = RECONNECT_BACKOFF
+                sock = tune_socket(websocket)
                 
-            # Check for exceptions
-            for task in done:
-                try:
-                    task.result()
-                except Exception as e:
-                    logger.error(f"Task error: {str(e)}")
+                # Forward stdin->websocket and websocket->stdout until either side ends
+                await run_until_first_done(
+                    forward_stdin_to_websocket(websocket, reader, sock),
+                    forward_websocket_to_stdout(websocket)
+                )
                     
-    except Exception as e:
-        logger.error(f"Connection error: {str(e)}")
+        except Exception as e:
+            logger.error("Connection error: %s", e)
+            # The address may have changed; look it up again
+            address = None
+        
+        if not reader.eof:
+            logger.info("Reconnecting in %.1fs", backoff)
+            # Watch stdin meanwhile and give up if it ends
+            await reader.read_ahead(backoff)
+            backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+    
+    if reader.backlog:
+        logger.warning("Stdin ended while disconnected; %d messages were not sent", len(reader.backlog))
         
-async def forward_stdin_to_websocket(websocket):
+def make_envelope(messages):
+    """Wrap several messages in one ["BATCH", message, ...] message."""
+    if not isinstance(messages[0], str):
+        return b'["BATCH",' + b",".join(messages) + b"]"
+    return f'["BATCH",{",".join(messages)}]'
+
+async def read_batch(reader, first):
+    """Collect the messages that follow the first one within the batch window.
+    
+    Returns the messages and whether stdin has ended.
+    """
+    messages = [first]
+    while len(messages) < BATCH_MAX_MESSAGES:
+        try:
+            message = await asyncio.wait_for(reader.read(), BATCH_WINDOW)
+        except asyncio.TimeoutError:
+            break
+        if message is None:
+            return messages, True
+        if message:
+            messages.append(message)
+    return messages, False
+
+async def forward_stdin_to_websocket(websocket, reader, sock=None):
     """Forward messages from stdin to the WebSocket server."""
-    loop = asyncio.get_event_loop()
-    while True:
-        # Read a line from stdin (non-blocking)
-        line = await loop.run_in_executor(None, sys.stdin.readline)
-        if not line:
-            logger.info("End of stdin, closing connection")
+    eof = False
+    while not eof:
+        # Read a message from stdin
+        message = await reader.read()
+        if message is None:
             break
             
-        # Parse and forward the message
+        # Forward the message
         try:
-            message = line.strip()
-            logger.debug(f"Sending to WS: {message}")
-            await websocket.send(message)
+            if BATCH_ENABLED and message:
+                messages, eof = await read_batch(reader, message)
+                if BATCH_ENVELOPE and len(messages) > 1:
+                    messages = [make_envelope(messages)]
+            else:
+                messages = [message]
+            with corked(sock if len(messages) > 1 else None):
+                for message in messages:
+                    logger.debug("Sending to WS: %s", message)
+                    await websocket.send(message)
         except Exception as e:
-            logger.error(f"Error forwarding stdin to WebSocket: {str(e)}")
-            break
+            logger.error("Error forwarding stdin to WebSocket: %s", e)
+            return
+    logger.info("End of stdin, closing connection")
+
+async def iter_messages(websocket):
+    """Yield whole WebSocket messages; undecoded bytes with MCP_RAW=1."""
+    if RAW_PASSTHROUGH and hasattr(websocket, "recv_streaming"):
+        while True:
+            yield await websocket.recv(decode=False)
+    else:
+        async for message in websocket:
+            yield message
 
 async def forward_websocket_to_stdout(websocket):
     """Forward messages from the WebSocket server to stdout."""
+    stdout = StdoutBuffer(sys.stdout.buffer, asyncio.get_running_loop())
     try:
-        async for message in websocket:
-            logger.debug(f"Received from WS: {message}")
-            # Write to stdout and flush
-            print(message, flush=True)
+        if LENGTH_FRAMING or not hasattr(websocket, "recv_streaming"):
+            # The length prefix needs the whole message
+            async for message in iter_messages(websocket):
+                logger.debug("Received from WS: %s", message)
+                stdout.write(message)
+        else:
+            # Pass fragments of a large message on as they arrive, without
+            # holding the whole message
+            while True:
+                async for fragment in websocket.recv_streaming(decode=False):
+                    logger.debug("Received from WS: %s", fragment)
+                    stdout.write_fragment(fragment)
+                stdout.end_message()
     except ConnectionClosed:
         logger.info("WebSocket connection closed")
     except Exception as e:
-        logger.error(f"Error forwarding WebSocket to stdout: {str(e)}")
+        logger.error("Error forwarding WebSocket to stdout: %s", e)
+    finally:
+        # A message cut off by a disconnect would otherwise run into the
+        # first message after reconnecting
+        stdout.abort_message()
+        stdout.flush()
+
+def parse_cpu_list(text):
+    """Parse a Linux CPU list such as "0-3,8" into a set of CPU numbers."""
+    cpus = set()
+    for part in text.strip().split(","):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+def current_cpu():
+    """Return the CPU this process last ran on."""
+    with open("/proc/self/stat") as f:
+        # The CPU last run on is field 39; split after the parenthesized name
+        return int(f.read().rpartition(")")[2].split()[36])
+
+def l3_siblings(cpu):
+    """Return the CPUs sharing an L3 cache with cpu, or None if sysfs lists no L3 cache."""
+    # The cache index that is L3 varies between CPUs, so find it by level
+    cache_dir = os.path.join(CPU_SYSFS, f"cpu{cpu}", "cache")
+    for name in sorted(os.listdir(cache_dir)):
+        if not name.startswith("index"):
+            continue
+        try:
+            with open(os.path.join(cache_dir, name, "level")) as f:
+                if f.read().strip() != "3":
+                    continue
+            with open(os.path.join(cache_dir, name, "shared_cpu_list")) as f:
+                return parse_cpu_list(f.read())
+        except FileNotFoundError:
+            continue
+    return None
+
+def apply_cpu_affinity():
+    """Pin the process to the CPUs selected by WS_ADAPTER_CPU_AFFINITY."""
+    if not CPU_AFFINITY or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        if CPU_AFFINITY == "auto":
+            cpus = l3_siblings(current_cpu())
+            if cpus is None:
+                logger.info("No L3 cache found; not setting CPU affinity")
+                return
+        else:
+            cpus = parse_cpu_list(CPU_AFFINITY)
+        os.sched_setaffinity(0, cpus)
+        logger.info("Pinned to CPUs %s", sorted(cpus))
+    except (OSError, ValueError, IndexError) as e:
+        logger.warning("Could not set CPU affinity %r: %s", CPU_AFFINITY, e)
 
 if __name__ == "__main__":
     try:
+        apply_cpu_affinity()
         # Run the message forwarding loop
-        asyncio.run(forward_messages())
+        run_event_loop(forward_messages())
     except KeyboardInterrupt:
         logger.info("Adapter terminated by user")
     except Exception as e:
-        logger.error(f"Unhandled exception: {str(e)}")
+        logger.error("Unhandled exception: %s", e)
         sys.exit(1)